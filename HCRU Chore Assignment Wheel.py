@@ -5,13 +5,360 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, simpledialog
 import os
-import sys
-from io import StringIO
+import queue
+import threading
 import traceback
-import pandas as pd
+from collections import OrderedDict, deque
+from collections.abc import MutableMapping
 
 import chore_wheel
 
+# pandas is only imported once the window is up, see load_libraries
+np = chore_wheel.lazy_module("numpy")
+pd = chore_wheel.lazy_module("pandas")
+
+# Rows rendered past the bottom of the visible grid when virtualizing
+ROW_BUFFER = 20
+# Rows moved per mouse wheel notch
+WHEEL_ROWS = 3
+# Unmodified sheets kept parsed in memory; others are re-read when picked
+MAX_LOADED_SHEETS = 4
+# How often module output is copied from the worker to the output window
+POLL_INTERVAL_MS = 50
+# Save rewrites the whole workbook once this share of a sheet's cells changed
+FULL_SAVE_FRACTION = 0.3
+# Edits kept for Undo; each holds only the cells or rows it changed
+UNDO_LIMIT = 100
+
+
+class SheetChanges:
+    """Edits made to one sheet since it was read from or saved to disk.
+
+    Rows are tracked by id so an edit still finds its row after rows above
+    it are added or deleted: rows from the file use their 0-based data row
+    as id and added rows get ids past the end. whole means the frame was
+    replaced and the sheet can only be written in full.
+    """
+
+    def __init__(self, saved_rows, whole=False):
+        """Start tracking a sheet that has saved_rows data rows on disk."""
+        self.saved_rows = saved_rows
+        self.ids = list(range(saved_rows))
+        self.next_id = saved_rows
+        self.cells = set()  # (row id, column name) pairs that were edited
+        self.columns = []  # Added columns, in order
+        self.whole = whole
+
+    def edit(self, pos, column):
+        """Record an edit to the cell at row position pos."""
+        self.cells.add((self.ids[pos], column))
+
+    def insert_rows(self, positions):
+        """Record new rows inserted so they sit at the given row positions."""
+        for pos in sorted(positions):
+            self.ids.insert(pos, self.next_id)
+            self.next_id += 1
+
+    def delete_rows(self, positions):
+        """Record the rows at the given row positions being deleted."""
+        positions = set(positions)
+        self.ids = [i for pos, i in enumerate(self.ids) if pos not in positions]
+
+    def add_column(self, column):
+        """Record a column appended to the sheet."""
+        self.columns.append(column)
+
+    def drop_column(self, column):
+        """Record an added column being removed again."""
+        if column in self.columns:
+            self.columns.remove(column)
+        else:
+            self.whole = True  # Already saved, so only a full write drops it
+
+    def size(self, n_columns):
+        """Roughly how many cells a patch would have to write or move."""
+        kept = sum(i < self.saved_rows for i in self.ids)
+        moved_rows = (self.saved_rows - kept) + (len(self.ids) - kept)
+        return len(self.cells) + moved_rows * n_columns + len(self.columns) * kept
+
+
+def _cell_value(value):
+    """A DataFrame value as openpyxl should store it."""
+    if pd.api.types.is_scalar(value) and pd.isna(value):
+        return None
+    return value.item() if hasattr(value, "item") else value
+
+
+def insert_rows(df, positions, rows):
+    """A copy of df with rows placed at the given ascending row positions.
+
+    The rows are put in with one concat and one take instead of a concat
+    per row; coded columns of rows are cast to df's chore codes.
+    """
+    total = len(df) + len(rows)
+    new = np.zeros(total, dtype=bool)
+    new[list(positions)] = True
+    order = np.empty(total, dtype=np.intp)
+    order[new] = np.arange(len(df), total)
+    order[~new] = np.arange(len(df))
+    coded = {
+        col: dtype
+        for col, dtype in df.dtypes.items()
+        if isinstance(dtype, pd.CategoricalDtype)
+    }
+    combined = pd.concat([df, rows.astype(coded)], ignore_index=True)
+    return combined.take(order).reset_index(drop=True)
+
+
+def drop_rows(df, positions):
+    """A copy of df without the rows at the given row positions."""
+    keep = np.ones(len(df), dtype=bool)
+    keep[list(positions)] = False
+    return df[keep].reset_index(drop=True)
+
+
+def set_cell(df, pos, column, value):
+    """Store value in a cell, teaching a coded column any new chore."""
+    values = df[column]
+    if isinstance(values.dtype, pd.CategoricalDtype) and pd.notna(value):
+        # A coded column only accepts known chores
+        if value not in values.cat.categories:
+            df[column] = values.cat.add_categories([value])
+    df.iloc[pos, df.columns.get_loc(column)] = value
+
+
+class EditHistory:
+    """Bounded undo and redo stacks of compact edits.
+
+    An edit is a tuple naming its sheet and only what changed:
+    ("cell", sheet, pos, column, old, new), ("insert" or "delete", sheet,
+    positions, rows) holding just those rows, or ("column", sheet, column).
+    Undoing an insert deletes the same rows and the other way round.
+    """
+
+    def __init__(self, limit=UNDO_LIMIT):
+        """Start with nothing to undo or redo."""
+        self.undo = deque(maxlen=limit)
+        self.redo = []
+
+    def push(self, edit):
+        """Record a new edit; whatever was undone can no longer be redone."""
+        self.undo.append(edit)
+        self.redo.clear()
+
+    def forget(self, sheets=None):
+        """Drop the edits to sheets whose frames were replaced, or all."""
+        for stack in (self.undo, self.redo):
+            kept = [e for e in stack if sheets is not None and e[1] not in sheets]
+            stack.clear()
+            stack.extend(kept)
+
+
+def _row_text(values):
+    """A row's cells as one lowercase string for the filter to search."""
+    return "\n".join("" if pd.isna(v) else str(v) for v in values).lower()
+
+
+class SheetIndex:
+    """Lowercase text of every row of a sheet, searched by the filter box.
+
+    Built once when a sheet is first filtered and kept in step with edits,
+    so a keystroke never re-reads the frame. A query that extends the
+    previous one only searches the rows that one matched.
+    """
+
+    def __init__(self, df):
+        """Index every row of df."""
+        # Whole columns at a time, then one join per row
+        columns = [
+            df[col].astype(object).where(df[col].notna(), "").astype(str).tolist()
+            for col in df.columns
+        ]
+        rows = zip(*columns) if columns else [()] * len(df)
+        self.texts = ["\n".join(cells).lower() for cells in rows]
+        self.query = ""
+        self.matches = None  # Row positions matching self.query
+
+    def search(self, query):
+        """Row positions whose cells contain every word of query."""
+        query = " ".join(query.lower().split())
+        if self.matches is not None and query.startswith(self.query):
+            rows = self.matches
+        else:
+            rows = range(len(self.texts))
+        texts = self.texts
+        for word in query.split():
+            rows = [pos for pos in rows if word in texts[pos]]
+        self.query, self.matches = query, list(rows)
+        return self.matches
+
+    def update(self, df, pos):
+        """Re-read the row at position pos after a cell edit."""
+        self.texts[pos] = _row_text(df.iloc[pos])
+        self.matches = None
+
+    def insert_rows(self, df, positions):
+        """Index the rows just inserted at the given row positions."""
+        for pos in sorted(positions):
+            self.texts.insert(pos, _row_text(df.iloc[pos]))
+        self.matches = None
+
+    def delete_rows(self, positions):
+        """Drop the rows deleted from the given row positions."""
+        positions = set(positions)
+        self.texts = [t for pos, t in enumerate(self.texts) if pos not in positions]
+        self.matches = None
+
+
+def patch_sheet(ws, df, changes):
+    """Write a sheet's change set into its openpyxl worksheet.
+
+    Returns False before touching ws if the worksheet does not have the
+    rows and columns the changes were recorded against.
+    """
+    headers = chore_wheel._header_columns(ws)
+    original = [col for col in df.columns if col not in changes.columns]
+    if ws.max_row - 1 != changes.saved_rows or not set(original) <= set(headers):
+        return False
+
+    # Delete bottom up, a run of neighbouring rows per call
+    kept = {i for i in changes.ids if i < changes.saved_rows}
+    deleted = [i for i in range(changes.saved_rows) if i not in kept]
+    while deleted:
+        end = deleted.pop()
+        start = end
+        while deleted and deleted[-1] == start - 1:
+            start = deleted.pop()
+        ws.delete_rows(start + 2, end - start + 1)
+
+    # The kept rows are now in order, so insert the new ones between them
+    new_rows = []
+    for pos, i in enumerate(changes.ids):
+        if i >= changes.saved_rows:
+            if pos + 2 <= ws.max_row:
+                ws.insert_rows(pos + 2)
+            new_rows.append(pos)
+
+    next_col = max(headers.values(), default=0) + 1
+    for col in changes.columns:
+        if col in df.columns and col not in headers:
+            ws.cell(row=1, column=next_col, value=col)
+            headers[col] = next_col
+            next_col += 1
+
+    position = {i: pos for pos, i in enumerate(changes.ids)}
+    cells = {(position[i], col) for i, col in changes.cells if i in position}
+    cells.update((pos, col) for pos in new_rows for col in df.columns)
+    cells.update(
+        (pos, col)
+        for col in changes.columns
+        if col in df.columns
+        for pos in range(len(df))
+    )
+    col_index = {col: j for j, col in enumerate(df.columns)}
+    for pos, col in cells:
+        if col in col_index:
+            # ws.cell(..., value=None) leaves the old value, so assign it
+            value = _cell_value(df.iat[pos, col_index[col]])
+            ws.cell(row=pos + 2, column=headers[col]).value = value
+    return True
+
+
+class LazyWorkbook(MutableMapping):
+    """Sheets of a workbook, each parsed from disk the first time it is used.
+
+    Only the sheet names are read up front. Parsed sheets stay in a bounded
+    least-recently-used cache; sheets that were modified are never evicted.
+    """
+
+    def __init__(self, file_path, sheets=None):
+        """Read sheet names, or take already parsed sheets as loaded."""
+        self.file_path = file_path
+        self.loaded = OrderedDict()
+        self.modified = set()
+        self.changes = {}  # Sheet name -> SheetChanges since the last save
+        if sheets is not None:
+            self.names = list(sheets)
+            self.loaded.update(sheets)
+            if chore_wheel.ASSIGNMENT_SHEET in sheets:
+                self.loaded[chore_wheel.ASSIGNMENT_SHEET] = (
+                    chore_wheel.encode_assignment_columns(
+                        sheets[chore_wheel.ASSIGNMENT_SHEET]
+                    )
+                )
+            # Keep the sheets a spin works on when trimming to the limit
+            for name in (chore_wheel.HISTORY_SHEET, chore_wheel.ASSIGNMENT_SHEET):
+                if name in self.loaded:
+                    self.loaded.move_to_end(name)
+            self._evict()
+        else:
+            # pandas picks the engine by format, so .xls files open too
+            with pd.ExcelFile(file_path) as workbook:
+                self.names = list(workbook.sheet_names)
+
+    def __getitem__(self, name):
+        if name not in self.names:
+            raise KeyError(name)
+        if name not in self.loaded:
+            df = pd.read_excel(self.file_path, sheet_name=name)
+            if name == chore_wheel.ASSIGNMENT_SHEET:
+                # Hold Week/Month columns as chore codes, not repeated strings
+                df = chore_wheel.encode_assignment_columns(df)
+            self.loaded[name] = df
+            self._evict()
+        self.loaded.move_to_end(name)
+        return self.loaded[name]
+
+    def __setitem__(self, name, df):
+        if name not in self.names:
+            self.names.append(name)
+        self.set_frame(name, df)
+        self.changes[name] = SheetChanges(len(df), whole=True)
+
+    def __delitem__(self, name):
+        self.names.remove(name)
+        self.loaded.pop(name, None)
+        self.modified.discard(name)
+        self.changes[name] = SheetChanges(0, whole=True)
+
+    def __iter__(self):
+        return iter(list(self.names))
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.names
+
+    def mark_modified(self, name):
+        """Keep a sheet that was changed in place from being evicted."""
+        self.modified.add(name)
+
+    def track(self, name):
+        """The change set of a loaded sheet, to record an edit in."""
+        self.mark_modified(name)
+        if name not in self.changes:
+            self.changes[name] = SheetChanges(len(self.loaded[name]))
+        return self.changes[name]
+
+    def set_frame(self, name, df):
+        """Swap in a sheet's new frame after recording how it changed."""
+        self.loaded[name] = df
+        self.loaded.move_to_end(name)
+        self.modified.add(name)
+        self._evict()
+
+    def mark_saved(self, names=None):
+        """Forget the change sets of sheets that now match the file."""
+        for name in list(self.changes) if names is None else names:
+            self.changes.pop(name, None)
+
+    def _evict(self):
+        """Drop the least recently used unmodified sheets over the limit."""
+        clean = [name for name in self.loaded if name not in self.modified]
+        while len(self.loaded) > MAX_LOADED_SHEETS and clean:
+            del self.loaded[clean.pop(0)]
+
 
 class ExcelDataEditor:
     """docstring goes here."""
@@ -25,8 +372,22 @@ class ExcelDataEditor:
         self.current_file = None
         self.excel_data = {}
         self.current_sheet = None
+        self.view_top = 0  # First sheet row rendered in the grid
+        self.worker = None  # Thread running a module, if any
+        self.history = EditHistory()
+        self.indexes = {}  # Sheet name -> SheetIndex, built when filtered
+        self.view_rows = None  # Row positions passing the filter, or all
 
         self.setup_ui()
+        # Show the window first; the data libraries take seconds to import
+        self.status_var.set("Loading...")
+        self.root.after_idle(self.load_libraries)
+
+    def load_libraries(self):
+        """Import the data libraries once the window is drawn, then open."""
+        self.root.update()
+        chore_wheel.load_data_libraries()
+        self.status_var.set("Ready")
         self.auto_open_chore_workbook()
 
     def setup_ui(self):
@@ -47,6 +408,9 @@ class ExcelDataEditor:
         # Edit menu
         edit_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Edit", menu=edit_menu)
+        edit_menu.add_command(label="Undo", command=self.undo, accelerator="Ctrl+Z")
+        edit_menu.add_command(label="Redo", command=self.redo, accelerator="Ctrl+Y")
+        edit_menu.add_separator()
         edit_menu.add_command(label="Add Row", command=self.add_row)
         edit_menu.add_command(label="Delete Row", command=self.delete_row)
         edit_menu.add_separator()
@@ -56,6 +420,7 @@ class ExcelDataEditor:
         tools_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Tools", menu=tools_menu)
         tools_menu.add_command(label="Assign Chores", command=self.assign_chores)
+        tools_menu.add_command(label="Statistics", command=self.show_stats)
 
         # Main frame
         main_frame = ttk.Frame(self.root)
@@ -93,6 +458,9 @@ class ExcelDataEditor:
         ttk.Button(toolbar, text="Assign Chores", command=self.assign_chores).pack(
             side=tk.LEFT, padx=(0, 5)
         )
+        ttk.Button(toolbar, text="Stats", command=self.show_stats).pack(
+            side=tk.LEFT, padx=(0, 5)
+        )
 
         # Sheet selection frame
         sheet_frame = ttk.Frame(main_frame)
@@ -106,6 +474,14 @@ class ExcelDataEditor:
         self.sheet_combo.pack(side=tk.LEFT, padx=(0, 5))
         self.sheet_combo.bind("<<ComboboxSelected>>", self.on_sheet_change)
 
+        # Filter box; shows only rows containing every word typed
+        ttk.Label(sheet_frame, text="Filter:").pack(side=tk.LEFT, padx=(10, 5))
+        self.filter_var = tk.StringVar()
+        filter_entry = ttk.Entry(sheet_frame, textvariable=self.filter_var, width=30)
+        filter_entry.pack(side=tk.LEFT, padx=(0, 5))
+        filter_entry.bind("<Escape>", lambda _: self.filter_var.set(""))
+        self.filter_var.trace_add("write", self.on_filter_change)
+
         # Treeview frame with scrollbars
         tree_frame = ttk.Frame(main_frame)
         tree_frame.pack(fill=tk.BOTH, expand=True)
@@ -114,12 +490,11 @@ class ExcelDataEditor:
         self.tree = ttk.Treeview(tree_frame)
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
-        # Scrollbars
-        v_scrollbar = ttk.Scrollbar(
-            tree_frame, orient=tk.VERTICAL, command=self.tree.yview
+        # Scrollbars (vertical scrolling moves the rendered row window)
+        self.v_scrollbar = ttk.Scrollbar(
+            tree_frame, orient=tk.VERTICAL, command=self.on_vscroll
         )
-        v_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.tree.configure(yscrollcommand=v_scrollbar.set)
+        self.v_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
         h_scrollbar = ttk.Scrollbar(
             main_frame, orient=tk.HORIZONTAL, command=self.tree.xview
@@ -136,6 +511,13 @@ class ExcelDataEditor:
 
         self.tree.bind("<Button-3>", self.show_context_menu)  # Right-click
         self.tree.bind("<Double-1>", self.edit_cell)  # Double-click to edit
+        self.tree.bind("<Configure>", self.on_tree_resize)
+        self.tree.bind("<MouseWheel>", self.on_mousewheel)
+        self.tree.bind("<Button-4>", self.on_mousewheel)
+        self.tree.bind("<Button-5>", self.on_mousewheel)
+        self.root.bind("<Control-z>", self.undo)
+        self.root.bind("<Control-y>", self.redo)
+        self.root.bind("<Control-Z>", self.redo)  # Ctrl+Shift+Z
 
         # Status bar
         self.status_var = tk.StringVar()
@@ -152,8 +534,19 @@ class ExcelDataEditor:
         finally:
             self.context_menu.grab_release()
 
+    def worker_busy(self):
+        """Warn and return True while a module is still using the workbook."""
+        if self.worker is not None and self.worker.is_alive():
+            messagebox.showwarning(
+                "Warning", "Wait for the running module to finish first"
+            )
+            return True
+        return False
+
     def open_file(self):
         """docstring goes here."""
+        if self.worker_busy():
+            return
         file_path = filedialog.askopenfilename(
             title="Open Excel File",
             filetypes=[("Excel files", "*.xlsx *.xls"), ("All files", "*.*")],
@@ -161,8 +554,10 @@ class ExcelDataEditor:
 
         if file_path:
             try:
-                self.excel_data = pd.read_excel(file_path, sheet_name=None)
+                self.excel_data = self.open_workbook(file_path)
                 self.current_file = file_path
+                self.history.forget()
+                self.indexes.clear()
 
                 # Update sheet combo
                 sheet_names = list(self.excel_data.keys())
@@ -170,6 +565,7 @@ class ExcelDataEditor:
                 if sheet_names:
                     self.sheet_var.set(sheet_names[0])
                     self.current_sheet = sheet_names[0]
+                    self.view_top = 0
                     self.display_sheet()
 
                 self.status_var.set(f"Opened: {os.path.basename(file_path)}")
@@ -177,16 +573,20 @@ class ExcelDataEditor:
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to open file: {str(e)}")
 
+    def open_workbook(self, file_path):
+        """Open a workbook lazily, or all at once from a valid sidecar cache."""
+        return LazyWorkbook(file_path, chore_wheel.read_cached_sheets(file_path))
+
     def save_file(self):
         """docstring goes here."""
+        if self.worker_busy():
+            return
         if not self.current_file:
             self.save_as_file()
             return
 
         try:
-            with pd.ExcelWriter(self.current_file, engine="openpyxl") as writer:
-                for sheet_name, df in self.excel_data.items():
-                    df.to_excel(writer, sheet_name=sheet_name, index=False)
+            self.write_workbook()
 
             self.status_var.set(f"Saved: {os.path.basename(self.current_file)}")
             messagebox.showinfo("Success", "File saved successfully!")
@@ -194,8 +594,64 @@ class ExcelDataEditor:
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save file: {str(e)}")
 
+    def write_workbook(self, full=False):
+        """Save the workbook, patching just the changes in when possible."""
+        if full or not self.patch_workbook():
+            self.rewrite_workbook()
+        self.excel_data.mark_saved()
+
+    def patch_workbook(self):
+        """Write only the changed cells and rows of changed sheets in place.
+
+        Sheets that were never touched are not parsed or written. Returns
+        False, leaving the file alone, when a full rewrite is needed: a sheet
+        was replaced, added or removed, too much of a sheet changed, or the
+        file no longer has the rows the changes were recorded against.
+        """
+        data = self.excel_data
+        if not isinstance(data, LazyWorkbook) or data.file_path != self.current_file:
+            return False  # Nothing open yet, or Save As to a new file
+        if not os.path.exists(data.file_path):
+            return False
+        for name, changes in data.changes.items():
+            if changes.whole or name not in data.loaded:
+                return False
+            df = data.loaded[name]
+            cells = max(1, len(df) * len(df.columns))
+            if changes.size(len(df.columns)) > FULL_SAVE_FRACTION * cells:
+                return False
+        if not data.changes:
+            return True
+
+        cached = chore_wheel.read_cached_sheets(data.file_path)
+        wb = chore_wheel.openpyxl.load_workbook(data.file_path)
+        for name, changes in data.changes.items():
+            if name not in wb.sheetnames:
+                return False
+            if not patch_sheet(wb[name], data.loaded[name], changes):
+                return False
+        wb.save(data.file_path)
+
+        # Bring a cache that matched the old file up to date with the patch
+        if cached is not None:
+            cached.update({name: data.loaded[name] for name in data.changes})
+            chore_wheel.write_sheet_cache(data.file_path, cached)
+        return True
+
+    def rewrite_workbook(self):
+        """Write every sheet to the current file and refresh its cache."""
+        sheets = dict(self.excel_data)  # Loads any sheets not yet parsed
+        with pd.ExcelWriter(self.current_file, engine="openpyxl") as writer:
+            for sheet_name, df in sheets.items():
+                df = chore_wheel.decode_assignment_columns(df)
+                df.to_excel(writer, sheet_name=sheet_name, index=False)
+        chore_wheel.write_sheet_cache(self.current_file, sheets)
+        self.excel_data.file_path = self.current_file
+
     def save_as_file(self):
         """docstring goes here."""
+        if self.worker_busy():
+            return
         file_path = filedialog.asksaveasfilename(
             title="Save Excel File",
             defaultextension=".xlsx",
@@ -211,10 +667,6 @@ class ExcelDataEditor:
         if not self.current_sheet or self.current_sheet not in self.excel_data:
             return
 
-        # Clear existing data
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
         df = self.excel_data[self.current_sheet]
 
         # Configure columns (without index)
@@ -226,15 +678,124 @@ class ExcelDataEditor:
             self.tree.heading(col, text=col)
             self.tree.column(col, width=120, minwidth=80, stretch=False)
 
+        self.refilter()
+        self.render_rows()
+
+    def row_count(self):
+        """Number of rows the grid can show: filter matches, or the sheet."""
+        if self.view_rows is not None:
+            return len(self.view_rows)
+        return len(self.excel_data.get(self.current_sheet, ()))
+
+    def refilter(self):
+        """Work out which rows of the current sheet pass the filter."""
+        query = self.filter_var.get()
+        if not query.strip() or self.current_sheet not in self.excel_data:
+            self.view_rows = None
+            return
+        if self.current_sheet not in self.indexes:
+            df = self.excel_data[self.current_sheet]
+            self.indexes[self.current_sheet] = SheetIndex(df)
+        self.view_rows = self.indexes[self.current_sheet].search(query)
+
+    def on_filter_change(self, *_):
+        """Show only the matching rows as the filter is typed."""
+        self.view_top = 0
+        self.refilter()
+        self.render_rows()
+        if self.view_rows is not None:
+            total = len(self.excel_data[self.current_sheet])
+            self.status_var.set(f"{len(self.view_rows)} of {total} rows match")
+
+    def visible_row_count(self):
+        """Number of data rows that fit in the grid at its current height."""
+        row_height = ttk.Style().lookup("Treeview", "rowheight") or 20
+        return max(1, self.tree.winfo_height() // int(row_height) - 1)
+
+    def render_rows(self):
+        """Materialize only the rows in view plus a buffer below them."""
+        self.tree.delete(*self.tree.get_children())
+        if not self.current_sheet or self.current_sheet not in self.excel_data:
+            return
+
+        df = self.excel_data[self.current_sheet]
+        total = self.row_count()
+        count = self.visible_row_count()
+        self.view_top = max(0, min(self.view_top, total - count))
+        end = min(total, self.view_top + count + ROW_BUFFER)
+        if self.view_rows is None:
+            positions = range(self.view_top, end)
+        else:
+            positions = self.view_rows[self.view_top : end]
+
         # Insert data (without index)
-        for idx, row in df.iterrows():
-            values = list(row)
-            # Store the actual dataframe index as a tag for internal use
-            self.tree.insert("", "end", values=values, tags=(str(idx),))
+        rows = df.iloc[positions].itertuples(index=False, name=None)
+        for pos, values in zip(positions, rows):
+            # Store the row position as the item id and tag for internal use
+            self.tree.insert("", "end", iid=str(pos), values=values, tags=(str(pos),))
+        self.tree.yview_moveto(0)
+        self.update_vscrollbar()
+
+    def update_vscrollbar(self):
+        """Size the scrollbar thumb to the rendered window of the sheet."""
+        total = self.row_count()
+        if not total:
+            self.v_scrollbar.set(0, 1)
+            return
+        count = self.visible_row_count()
+        self.v_scrollbar.set(
+            self.view_top / total, min(1, (self.view_top + count) / total)
+        )
+
+    def scroll_to(self, top):
+        """Move the rendered window so that row position top is first."""
+        total = self.row_count()
+        top = max(0, min(top, total - self.visible_row_count()))
+        if top != self.view_top:
+            self.view_top = top
+            self.render_rows()
+
+    def on_vscroll(self, *args):
+        """Handle scrollbar drags and clicks by shifting the row window."""
+        total = self.row_count()
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * total))
+        elif args[0] == "scroll":
+            step = self.visible_row_count() if args[2] == "pages" else 1
+            self.scroll_to(self.view_top + int(args[1]) * step)
+
+    def on_mousewheel(self, event):
+        """Scroll the row window with the mouse wheel."""
+        if event.num == 4 or event.delta > 0:
+            self.scroll_to(self.view_top - WHEEL_ROWS)
+        else:
+            self.scroll_to(self.view_top + WHEEL_ROWS)
+        return "break"
+
+    def on_tree_resize(self, _=None):
+        """Render enough rows to fill the grid after it is resized."""
+        total = self.row_count()
+        wanted = min(total - self.view_top, self.visible_row_count() + ROW_BUFFER)
+        if wanted > len(self.tree.get_children()):
+            self.render_rows()
+        else:
+            self.update_vscrollbar()
+
+    def refresh_row(self, row_index):
+        """Redraw one sheet row if it is currently rendered."""
+        iid = str(row_index)
+        if self.tree.exists(iid):
+            df = self.excel_data[self.current_sheet]
+            self.tree.item(iid, values=tuple(df.iloc[row_index]))
 
     def on_sheet_change(self, _=None):
         """docstring goes here."""
+        if self.worker_busy():
+            # Reading another sheet could catch the workbook mid-save
+            self.sheet_var.set(self.current_sheet or "")
+            return
         self.current_sheet = self.sheet_var.get()
+        self.view_top = 0
         self.display_sheet()
 
     def get_selected_row_indices(self):
@@ -247,48 +808,64 @@ class ExcelDataEditor:
         return tags
 
     def add_row(self):
-        """docstring goes here."""
+        """Insert a blank row below each selected row, or one at the end."""
+        if self.worker_busy():
+            return
         if not self.current_sheet:
             messagebox.showwarning("Warning", "No sheet selected")
             return
 
         df = self.excel_data[self.current_sheet]
-
-        # Create new row with empty values
-        new_row = pd.Series([None] * len(df.columns), index=df.columns)
-
-        # Add to dataframe
-        self.excel_data[self.current_sheet] = pd.concat(
-            [df, new_row.to_frame().T], ignore_index=True
-        )
-
-        self.display_sheet()
-        self.status_var.set("Row added")
+        selected = sorted(set(self.get_selected_row_indices()))
+        if self.filter_var.get():
+            # Blank rows would never match the filter, so show every row again
+            self.filter_var.set("")
+        # Each blank row lands just below its selected row, once the blank
+        # rows above it are in as well
+        positions = [pos + 1 + k for k, pos in enumerate(selected)] or [len(df)]
+
+        # All new rows go in with one operation, and one undo step. Blanks
+        # in integer columns are objects, so counts are not shown as floats
+        numbers = {
+            col: object
+            for col, dtype in df.dtypes.items()
+            if pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_bool_dtype(dtype)
+        }
+        rows = df.iloc[:0].astype(numbers).reindex(range(len(positions)))
+        self.record(("insert", self.current_sheet, positions, rows))
+
+        # Only the rendered window needs redrawing
+        self.render_rows()
+        self.status_var.set(f"{len(positions)} row(s) added")
 
     def delete_row(self):
         """docstring goes here."""
+        if self.worker_busy():
+            return
         if not self.current_sheet:
             messagebox.showwarning("Warning", "No sheet selected")
             return
 
-        row_indices = self.get_selected_row_indices()
-        if row_indices is None:
+        row_indices = sorted(set(self.get_selected_row_indices()))
+        if not row_indices:
             messagebox.showwarning("Warning", "No row(s) selected")
             return
 
         # Confirm deletion
         if messagebox.askyesno("Confirm", f"Delete row(s) {row_indices}?"):
-            for row_index in reversed(row_indices):
-                df = self.excel_data[self.current_sheet]
-                self.excel_data[self.current_sheet] = df.drop(
-                    df.index[row_index]
-                ).reset_index(drop=True)
+            # Keep just the deleted rows so they can be put back
+            df = self.excel_data[self.current_sheet]
+            rows = df.iloc[row_indices].reset_index(drop=True)
+            self.record(("delete", self.current_sheet, row_indices, rows))
 
-            self.display_sheet()
+            # Later rows shift up, so redraw the rendered window only
+            self.render_rows()
             self.status_var.set(f"Row(s) {row_indices} deleted")
 
     def add_column(self):
         """docstring goes here."""
+        if self.worker_busy():
+            return
         if not self.current_sheet:
             return
 
@@ -302,13 +879,15 @@ class ExcelDataEditor:
             return
 
         # Add a new empty column
-        df[col_name] = ""
+        self.record(("column", self.current_sheet, col_name))
 
         self.display_sheet()
         self.status_var.set(f"New Column: {col_name} created")
 
     def edit_cell(self, event):
         """docstring goes here."""
+        if self.worker_busy():
+            return
         if not self.current_sheet:
             return
 
@@ -342,97 +921,324 @@ class ExcelDataEditor:
             except:
                 pass  # Keep as string
 
-            self.excel_data[self.current_sheet].iloc[row_index, col_index] = new_value
-            self.display_sheet()
+            self.record(
+                (
+                    "cell",
+                    self.current_sheet,
+                    row_index,
+                    df.columns[col_index],
+                    current_value,
+                    new_value,
+                )
+            )
+            self.refresh_row(row_index)
             self.status_var.set("Cell updated")
 
-    def assign_chores(self):
-        """Assign randomized chores to employees"""
-        self._run_specific_module("assign_chores", "chore_wheel.main()")
+    def record(self, edit):
+        """Apply a new edit and put it on the undo stack."""
+        self.apply_edit(edit)
+        self.history.push(edit)
+
+    def apply_edit(self, edit, undo=False):
+        """Make an edit, or reverse it, in a sheet and its change set."""
+        kind, sheet = edit[:2]
+        if undo and kind in ("insert", "delete"):
+            kind = "delete" if kind == "insert" else "insert"
+        df = self.excel_data[sheet]
+        changes = self.excel_data.track(sheet)
+        index = self.indexes.get(sheet)
+        if kind == "cell":
+            _, _, pos, column, old, new = edit
+            set_cell(df, pos, column, old if undo else new)
+            changes.edit(pos, column)
+            if index is not None:
+                index.update(df, pos)
+        elif kind == "insert":
+            _, _, positions, rows = edit
+            df = insert_rows(df, positions, rows)
+            self.excel_data.set_frame(sheet, df)
+            changes.insert_rows(positions)
+            if index is not None:
+                index.insert_rows(df, positions)
+        elif kind == "delete":
+            self.excel_data.set_frame(sheet, drop_rows(df, edit[2]))
+            changes.delete_rows(edit[2])
+            if index is not None:
+                index.delete_rows(edit[2])
+        elif undo:
+            self.excel_data.set_frame(sheet, df.drop(columns=edit[2]))
+            changes.drop_column(edit[2])
+        else:
+            df[edit[2]] = ""
+            changes.add_column(edit[2])
 
-    def _run_specific_module(self, module_name, function_call):
-        """Generic method to run a specific module's main function"""
-        # Run the module
-        try:
-            # Capture stdout/stderr
-            old_stdout = sys.stdout
-            old_stderr = sys.stderr
+        # Row positions shift with inserts and deletes, so filter again
+        if kind in ("insert", "delete") and sheet == self.current_sheet:
+            self.refilter()
 
-            stdout_capture = StringIO()
-            stderr_capture = StringIO()
+    def undo(self, _=None):
+        """Reverse the most recent edit."""
+        if self.worker_busy():
+            return
+        self.step(self.history.undo, self.history.redo, undo=True)
 
-            # Create output window
-            output_window = tk.Toplevel(self.root)
-            output_window.withdraw()
-            output_window.title(f"Module Output - {module_name}")
-            output_window.geometry("600x400")
+    def redo(self, _=None):
+        """Make the most recently undone edit again."""
+        if self.worker_busy():
+            return
+        self.step(self.history.redo, self.history.undo, undo=False)
 
-            # Text widget with scrollbar
-            text_frame = ttk.Frame(output_window)
-            text_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+    def step(self, source, target, undo):
+        """Move one edit between the undo and redo stacks and show it."""
+        if not source:
+            self.status_var.set(f"Nothing to {'undo' if undo else 'redo'}")
+            return
+        edit = source.pop()
+        self.apply_edit(edit, undo)
+        target.append(edit)
+
+        kind, sheet = edit[:2]
+        if sheet != self.current_sheet:
+            self.current_sheet = sheet
+            self.sheet_var.set(sheet)
+            self.display_sheet()
+        elif kind == "cell":
+            self.refresh_row(edit[2])
+        elif kind == "column":
+            self.display_sheet()
+        else:
+            self.render_rows()
+        self.status_var.set(f"{'Undid' if undo else 'Redid'} {kind} edit")
 
-            output_text = tk.Text(text_frame, wrap=tk.WORD)
-            output_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+    def assign_chores(self):
+        """Assign randomized chores to employees"""
+        self._run_specific_module("assign_chores", "chore_wheel.spin()")
 
-            output_text.insert(tk.END, f"Running {function_call}\n")
-            output_text.insert(tk.END, "=" * 50 + "\n\n")
+    def _run_specific_module(self, module_name, function_call):
+        """Run a module on a worker thread, streaming its log to a window"""
+        if self.worker_busy():
+            return
+        if not self.current_file or not self.excel_data:
+            messagebox.showwarning("Warning", "Open a chore workbook first")
+            return
 
-            scrollbar = ttk.Scrollbar(text_frame, command=output_text.yview)
-            scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-            output_text.config(yscrollcommand=scrollbar.set)
+        # Create output window
+        output_window = tk.Toplevel(self.root)
+        output_window.title(f"Module Output - {module_name}")
+        output_window.geometry("600x400")
 
-            try:
-                sys.stdout = stdout_capture
-                sys.stderr = stderr_capture
+        # Buttons and progress indicator along the bottom
+        button_frame = ttk.Frame(output_window)
+        button_frame.pack(side=tk.BOTTOM, pady=10)
+        progress = ttk.Progressbar(output_window, mode="indeterminate")
+        progress.pack(side=tk.BOTTOM, fill=tk.X, padx=10)
 
-                # Import and execute the specific module
-                try:
-                    if module_name == "assign_chores":
-                        file_path = self.current_file
-                        chore_wheel.main(file_path, False)
-
-                except Exception as e:
-                    output_text.insert(tk.END, f"ERROR during execution: {str(e)}\n")
-                    output_text.insert(
-                        tk.END, f"Traceback:\n{traceback.format_exc()}\n"
-                    )
+        # Text widget with scrollbar
+        text_frame = ttk.Frame(output_window)
+        text_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
-                # Get captured output
-                stdout_value = stdout_capture.getvalue()
-                stderr_value = stderr_capture.getvalue()
+        output_text = tk.Text(text_frame, wrap=tk.WORD)
+        output_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
-                if stdout_value:
-                    output_text.insert(tk.END, "OUTPUT:\n")
-                    output_text.insert(tk.END, stdout_value + "\n")
+        output_text.insert(tk.END, f"Running {function_call}\n")
+        output_text.insert(tk.END, "=" * 50 + "\n\n")
 
-                if stderr_value:
-                    output_text.insert(tk.END, "ERRORS:\n")
-                    output_text.insert(tk.END, stderr_value + "\n")
+        scrollbar = ttk.Scrollbar(text_frame, command=output_text.yview)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        output_text.config(yscrollcommand=scrollbar.set)
 
-                if not stdout_value and not stderr_value:
-                    output_text.insert(
-                        tk.END, f"{function_call} executed successfully (no output)\n"
+        cancel = threading.Event()
+        cancel_button = ttk.Button(button_frame, text="Cancel", command=cancel.set)
+        cancel_button.pack(side=tk.LEFT, padx=5)
+        close_button = ttk.Button(
+            button_frame, text="Close", command=output_window.destroy
+        )
+        close_button.pack(side=tk.LEFT, padx=5)
+        close_button.state(["disabled"])
+        # Closing the window while running asks the worker to stop instead
+        output_window.protocol("WM_DELETE_WINDOW", cancel.set)
+
+        # The worker only talks to Tk through this queue
+        messages = queue.Queue()
+        file_path = self.current_file
+        if chore_wheel.ASSIGNMENT_SHEET in self.excel_data:
+            wanted = [chore_wheel.ASSIGNMENT_SHEET, chore_wheel.HISTORY_SHEET]
+        else:
+            wanted = list(self.excel_data)
+        sheets = {
+            name: self.excel_data[name] for name in wanted if name in self.excel_data
+        }
+        spun = [chore_wheel.ASSIGNMENT_SHEET, chore_wheel.HISTORY_SHEET]
+        # save_spin only writes the spin itself, so earlier edits stay unsaved
+        pending = {name for name in spun if name in self.excel_data.changes}
+
+        def log(message):
+            messages.put(("log", str(message)))
+
+        def assign_chores():
+            assignments_df, history_df = chore_wheel.select_sheets(sheets, log)
+            result = chore_wheel.spin(
+                assignments_df, history_df, log=log, cancel=cancel
+            )
+            # Hand the frames to the editor now, then persist in the background
+            messages.put(("result", result))
+            if chore_wheel.save_spin(file_path, *result):
+                messages.put(("saved", None))
+                log(f"All chores and history saved to {file_path}.")
+            else:
+                messages.put(("save", "Workbook changed on disk; saving all sheets"))
+
+        def work():
+            try:
+                if module_name == "assign_chores":
+                    metrics = chore_wheel.SpinMetrics()
+                    with chore_wheel.instrument(metrics):
+                        assign_chores()
+                    for line in metrics.summary():
+                        log(line)
+                    if chore_wheel.METRICS_LOG:
+                        metrics.write(chore_wheel.METRICS_LOG, file=file_path)
+                messages.put(("done", f"{function_call} finished"))
+            except chore_wheel.SpinCancelled as e:
+                messages.put(("cancelled", str(e)))
+            except Exception as e:
+                messages.put(
+                    (
+                        "error",
+                        f"ERROR during execution: {str(e)}\n"
+                        f"Traceback:\n{traceback.format_exc()}",
                     )
+                )
+
+        def apply_result(result):
+            assignments_df, history_df, _ = result
+            if chore_wheel.ASSIGNMENT_SHEET not in self.excel_data:
+                log(f"Added sheet '{chore_wheel.ASSIGNMENT_SHEET}'")
+            self.excel_data[chore_wheel.ASSIGNMENT_SHEET] = assignments_df
+            self.excel_data[chore_wheel.HISTORY_SHEET] = history_df
+            self.history.forget(
+                [chore_wheel.ASSIGNMENT_SHEET, chore_wheel.HISTORY_SHEET]
+            )
+            self.indexes.pop(chore_wheel.ASSIGNMENT_SHEET, None)
+            self.indexes.pop(chore_wheel.HISTORY_SHEET, None)
+            self.sheet_combo["values"] = list(self.excel_data.keys())
+            cancel_button.state(["disabled"])
+            self.display_sheet()
 
-            finally:
-                sys.stdout = old_stdout
-                sys.stderr = old_stderr
-
+        def finish(kind):
+            progress.stop()
+            cancel_button.state(["disabled"])
+            close_button.state(["!disabled"])
+            output_window.protocol("WM_DELETE_WINDOW", output_window.destroy)
+            if kind == "done":
+                self.status_var.set(f"Executed {module_name} module")
+            else:
+                self.status_var.set(f"{module_name} module {kind}")
+
+        def poll():
+            while True:
+                try:
+                    kind, payload = messages.get_nowait()
+                except queue.Empty:
+                    break
+                if kind == "result":
+                    apply_result(payload)
+                    continue
+                if kind == "saved":
+                    # The file now matches the spun sheets that had no edits
+                    self.excel_data.mark_saved(
+                        [name for name in spun if name not in pending]
+                    )
+                    continue
+                if kind == "save":
+                    try:
+                        self.write_workbook(full=True)
+                        payload += f"\nAll sheets saved to {file_path}."
+                    except Exception as e:
+                        payload += f"\nERROR saving workbook: {str(e)}"
+                if output_text.winfo_exists():
+                    output_text.insert(tk.END, payload + "\n")
+                    output_text.see(tk.END)
+                if kind in ("log", "save"):
+                    continue
+                finish(kind)
+                return
+            self.root.after(POLL_INTERVAL_MS, poll)
+
+        self.worker = threading.Thread(target=work, daemon=True)
+        progress.start(10)
+        self.status_var.set(f"Running {module_name} module...")
+        self.worker.start()
+        self.root.after(POLL_INTERVAL_MS, poll)
+
+    def show_stats(self):
+        """Show each person's totals, streaks and last week at each chore."""
+        if self.worker_busy():
+            return
+        if not self.current_file or not os.path.exists(self.current_file):
+            messagebox.showwarning("Warning", "Open a saved chore workbook first")
+            return
+        try:
+            # Read from the saved aggregates, not by scanning the Week columns
+            stats = chore_wheel.workbook_stats(self.current_file, log=lambda _: None)
         except Exception as e:
-            output_text.insert(tk.END, f"UNEXPECTED ERROR: {str(e)}\n")
-            output_text.insert(tk.END, f"Traceback:\n{traceback.format_exc()}\n")
+            messagebox.showerror("Error", f"Failed to read statistics: {str(e)}")
+            return
 
-        # Close button
-        ttk.Button(output_window, text="Close", command=output_window.destroy).pack(
-            pady=10
-        )
+        stats_window = tk.Toplevel(self.root)
+        stats_window.title(f"Statistics - {os.path.basename(self.current_file)}")
+        stats_window.geometry("900x500")
 
-        # Show the output window
-        output_window.deiconify()
+        totals = list(stats["totals"].values())
+        summary = f"{stats['weeks']} weeks assigned."
+        if totals:
+            summary += (
+                f" Chores per person: {min(totals)} to {max(totals)}"
+                f" (spread {stats['spread']}), mean {sum(totals) / len(totals):.1f}."
+            )
+        if getattr(self.excel_data, "changes", None):
+            summary += " Unsaved edits are not included."
+        ttk.Label(stats_window, text=summary).pack(fill=tk.X, padx=10, pady=(10, 5))
+
+        frame = ttk.Frame(stats_window)
+        frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        columns = ["Employee", "Total", "Streak", "Longest"] + stats["chores"]
+        tree = ttk.Treeview(frame, columns=columns, show="headings")
+        v_scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=tree.yview)
+        h_scrollbar = ttk.Scrollbar(frame, orient=tk.HORIZONTAL, command=tree.xview)
+        tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+        v_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        h_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        # Sort keys per row and column; chores sort by turns, then last week
+        keys = {}
+        for i, person in enumerate(stats["people"]):
+            counts = stats["counts"][i].tolist()
+            last = stats["last_done"][i].tolist()
+            values = [
+                person,
+                sum(counts),
+                int(stats["streaks"][i]),
+                int(stats["longest_streaks"][i]),
+            ]
+            values += [f"{n} (Week {w})" if w else str(n) for n, w in zip(counts, last)]
+            iid = tree.insert("", "end", values=values)
+            keys[iid] = [str(person)] + values[1:4] + list(zip(counts, last))
+
+        def sort_by(j, descending=False):
+            for pos, iid in enumerate(
+                sorted(keys, key=lambda iid: keys[iid][j], reverse=descending)
+            ):
+                tree.move(iid, "", pos)
+            tree.heading(
+                columns[j], command=lambda: sort_by(j, descending=not descending)
+            )
 
-        self.auto_open_chore_workbook()
-        self.display_sheet()
-        self.status_var.set(f"Executed {module_name} module")
+        for j, col in enumerate(columns):
+            tree.heading(col, text=col, command=lambda j=j: sort_by(j))
+            tree.column(col, width=140 if j == 0 or j > 3 else 70, stretch=False)
+        sort_by(1, descending=True)
 
     def auto_open_chore_workbook(self):
         """Automatically open ChoreAssignments.xlsx and select 'Assignments' sheet if present"""
@@ -445,8 +1251,10 @@ class ExcelDataEditor:
         # Check if workbook_path exists in the current directory
         if os.path.exists(workbook_path):
             try:
-                self.excel_data = pd.read_excel(workbook_path, sheet_name=None)
+                self.excel_data = self.open_workbook(workbook_path)
                 self.current_file = workbook_path
+                self.history.forget()
+                self.indexes.clear()
 
                 # Update sheet combo
                 sheet_names = list(self.excel_data.keys())
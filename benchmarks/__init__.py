@@ -0,0 +1,4 @@
+"""Benchmarks for the chore wheel pipeline on synthetic workbooks.
+
+Run ``python -m benchmarks --help`` from the repository root.
+"""
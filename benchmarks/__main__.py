@@ -0,0 +1,235 @@
+"""Time each stage of the chore pipeline on a synthetic workbook.
+
+Results are printed (or written with --output) as JSON so runs from
+different commits can be compared. Tk timings need a display; run under
+xvfb-run on a headless machine, otherwise they are reported as skipped.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+
+import pandas as pd
+
+import chore_wheel
+from benchmarks.synthetic import make_chores, make_frames, write_workbook
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GUI_PATH = os.path.join(REPO_DIR, "HCRU Chore Assignment Wheel.py")
+
+
+def quiet(*_):
+    """Log sink that drops chore_wheel's progress messages."""
+
+
+def time_stage(run, setup=None, repeat=3):
+    """Run a stage repeat times, each after its own untimed setup."""
+    seconds = []
+    for _ in range(repeat):
+        args = setup() if setup else ()
+        start = time.perf_counter()
+        run(*args)
+        seconds.append(time.perf_counter() - start)
+    return {
+        "min": min(seconds),
+        "median": statistics.median(seconds),
+        "runs": seconds,
+    }
+
+
+def time_display_sheet(main_df, repeat):
+    """Time ExcelDataEditor.display_sheet, or say why Tk is unavailable."""
+    try:
+        import tkinter as tk
+
+        root = tk.Tk()
+    except Exception as e:  # No tkinter or no display
+        return {"skipped": str(e)}
+    try:
+        spec = importlib.util.spec_from_file_location("chore_wheel_gui", GUI_PATH)
+        gui = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(gui)
+        editor = gui.ExcelDataEditor(root)
+        # Let the deferred load_libraries run now, without it opening a
+        # ChoreAssignments.xlsx from the current folder over the test frames
+        editor.auto_open_chore_workbook = lambda: None
+        root.update()
+        editor.excel_data = {chore_wheel.ASSIGNMENT_SHEET: main_df}
+        editor.current_sheet = chore_wheel.ASSIGNMENT_SHEET
+
+        def run():
+            editor.display_sheet()
+            root.update_idletasks()
+
+        return time_stage(run, repeat=repeat)
+    finally:
+        root.destroy()
+
+
+def run_benchmarks(employees, chores, weeks, out_ratio, repeat, seed):
+    """Build a workbook with the given shape and time every stage on it."""
+    chore_table = make_chores(chores)
+    main_df, history_df = make_frames(employees, chore_table, weeks, out_ratio, seed)
+    workdir = tempfile.mkdtemp(prefix="chore_bench_")
+    source = os.path.join(workdir, "source.xlsx")
+    target = os.path.join(workdir, "ChoreAssignments.xlsx")
+    write_workbook(source, main_df, history_df)
+    sheets = [chore_wheel.ASSIGNMENT_SHEET, chore_wheel.HISTORY_SHEET]
+
+    def fresh_copy():
+        shutil.copyfile(source, target)
+        cache = chore_wheel._cache_path(target)
+        if os.path.exists(cache):
+            os.remove(cache)
+        return (target,)
+
+    def spun():
+        """Frames and history after one week, as a save would see them."""
+        random.seed(seed)
+        history = chore_wheel.ChoreHistory.from_dataframe(history_df)
+        spun_df, history = chore_wheel.spin_week(main_df.copy(), history, log=quiet)
+        return target, spun_df, history
+
+    def spin_inputs():
+        random.seed(seed)
+        history = chore_wheel.ChoreHistory.from_dataframe(history_df)
+        return main_df, chore_table, [], last, history
+
+    def save_inputs():
+        fresh_copy()
+        return spun()
+
+    last = chore_wheel.get_last_chore_assignments(main_df)
+    random.seed(seed)
+    assignments = chore_wheel.assign_chores_fairly(
+        main_df, chore_table, [], last, history_df
+    )
+    next_col = f"Week {weeks + 1}"
+
+    def excel_writer_save(path, spun_df, history):
+        with pd.ExcelWriter(path, engine="openpyxl", mode="w") as writer:
+            spun_df.to_excel(writer, index=False, sheet_name=sheets[0])
+            history.to_dataframe().to_excel(writer, index=False, sheet_name=sheets[1])
+
+    stages = {}
+    try:
+        stages["load_excel"] = time_stage(
+            lambda path: chore_wheel.load_excel(path, quiet), fresh_copy, repeat
+        )
+
+        def cached_copy():
+            fresh_copy()
+            chore_wheel.read_workbook(target)
+            return (target,)
+
+        stages["load_excel_cached"] = time_stage(
+            lambda path: chore_wheel.load_excel(path, quiet), cached_copy, repeat
+        )
+        stages["load_spin_columns"] = time_stage(
+            chore_wheel.load_spin_columns, fresh_copy, repeat
+        )
+        stages["get_last_chore_assignments"] = time_stage(
+            lambda: chore_wheel.get_last_chore_assignments(main_df), repeat=repeat
+        )
+        stages["assign_chores_fairly"] = time_stage(
+            chore_wheel.assign_chores_fairly, spin_inputs, repeat
+        )
+        stages["assign_chores_optimally"] = time_stage(
+            chore_wheel.assign_chores_optimally, spin_inputs, repeat
+        )
+        stages["write_assignments"] = time_stage(
+            chore_wheel.write_assignments,
+            lambda: (main_df.copy(), assignments, next_col),
+            repeat,
+        )
+        stages["update_history"] = time_stage(
+            chore_wheel.update_history,
+            lambda: (chore_wheel.ChoreHistory.from_dataframe(history_df), assignments),
+            repeat,
+        )
+        stages["excel_writer_save"] = time_stage(excel_writer_save, save_inputs, repeat)
+
+        def autofit_inputs():
+            excel_writer_save(*save_inputs())
+            return target, sheets
+
+        stages["autofit_column_widths"] = time_stage(
+            chore_wheel.autofit_column_widths, autofit_inputs, repeat
+        )
+        stages["save_workbook"] = time_stage(
+            chore_wheel.save_workbook, save_inputs, repeat
+        )
+        stages["update_workbook"] = time_stage(
+            chore_wheel.update_workbook, save_inputs, repeat
+        )
+        stages["display_sheet"] = time_display_sheet(main_df, repeat)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return stages
+
+
+def git_commit():
+    """Current commit of the repository, if git is available."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=REPO_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    """Parse options, run the benchmarks and emit the JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=500)
+    parser.add_argument("--chores", type=int, default=len(chore_wheel.WEEKLY_CHORES))
+    parser.add_argument("--weeks", type=int, default=104)
+    parser.add_argument("--out-ratio", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "params": {
+            "employees": args.employees,
+            "chores": args.chores,
+            "weeks": args.weeks,
+            "out_ratio": args.out_ratio,
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "stages": run_benchmarks(
+            args.employees,
+            args.chores,
+            args.weeks,
+            args.out_ratio,
+            args.repeat,
+            args.seed,
+        ),
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Synthetic ChoreAssignments workbooks of any size."""
+
+import numpy as np
+import pandas as pd
+
+import chore_wheel
+
+
+def make_chores(n_chores, people_per_chore=2):
+    """Weekly chore table with n_chores generated chore names."""
+    return {f"Chore {i + 1}": people_per_chore for i in range(n_chores)}
+
+
+def make_frames(n_employees, chores, n_weeks, out_ratio=0.0, seed=0):
+    """Assignments and Chore History frames with n_weeks of random history.
+
+    Week/Month columns follow the numbering chore_wheel.spin_week produces,
+    and Chore History holds the counts implied by those columns.
+    """
+    rng = np.random.default_rng(seed)
+    names = np.array([f"Employee {i + 1}" for i in range(n_employees)], dtype=object)
+    chore_names = np.array(list(chores), dtype=object)
+    columns = {chore_wheel.EMPLOYEE_COLUMN: names}
+    if out_ratio > 0:
+        columns[chore_wheel.OUT_COLUMN] = rng.random(n_employees) < out_ratio
+
+    slots = min(sum(chores.values()), n_employees)
+    counts = np.zeros((n_employees, len(chore_names)), dtype=np.int64)
+    month = 0
+    for week in range(1, n_weeks + 1):
+        if week > 2 and (week + 1) % 4 in chore_wheel.MONTHLY_CHORES:
+            month += 1
+            monthly = np.full(n_employees, np.nan, dtype=object)
+            monthly[rng.choice(n_employees, 3, replace=False)] = "Monthly Chore"
+            columns[f"Month {month}"] = monthly
+        people = rng.choice(n_employees, slots, replace=False)
+        picks = rng.integers(0, len(chore_names), slots)
+        weekly = np.full(n_employees, np.nan, dtype=object)
+        weekly[people] = chore_names[picks]
+        columns[f"Week {week}"] = weekly
+        np.add.at(counts, (people, picks), 1)
+
+    main_df = pd.DataFrame(columns)
+    history_df = pd.DataFrame(counts, columns=list(chore_names))
+    history_df.insert(0, chore_wheel.EMPLOYEE_COLUMN, names)
+    return main_df, history_df
+
+
+def write_workbook(file_path, main_df, history_df):
+    """Save the frames as a ChoreAssignments workbook."""
+    with pd.ExcelWriter(file_path, engine="openpyxl", mode="w") as writer:
+        main_df.to_excel(writer, index=False, sheet_name=chore_wheel.ASSIGNMENT_SHEET)
+        history_df.to_excel(writer, index=False, sheet_name=chore_wheel.HISTORY_SHEET)
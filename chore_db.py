@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+
+"""Optional SQLite storage for the chore wheel.
+
+The database holds employees, chores and one assignments row per person
+per week; Chore History is a view over those rows. A spin only inserts the
+new week's rows in a single transaction, and ChoreAssignments.xlsx becomes
+a report produced by export.
+
+    python chore_db.py import ChoreAssignments.xlsx chores.db
+    python chore_db.py roster ChoreAssignments.xlsx chores.db
+    python chore_db.py spin chores.db --weeks 2
+    python chore_db.py export chores.db ChoreAssignments.xlsx
+"""
+
+import argparse
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+import chore_wheel
+from chore_wheel import AWAY_COLUMN, EMPLOYEE_COLUMN, OUT_COLUMN, TAGS_COLUMN
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS employees (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    position INTEGER,  -- Row on the Assignments sheet, NULL if only in history
+    out INTEGER NOT NULL DEFAULT 0,
+    tags TEXT,  -- Tags and Away cells as text, parsed by chore_wheel
+    away TEXT
+);
+CREATE TABLE IF NOT EXISTS chores (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS assignments (
+    week INTEGER NOT NULL,
+    employee_id INTEGER NOT NULL REFERENCES employees(id),
+    chore_id INTEGER NOT NULL REFERENCES chores(id),
+    monthly INTEGER NOT NULL DEFAULT 0,  -- Also in that week's Month column
+    PRIMARY KEY (week, employee_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS assignments_counts
+    ON assignments(employee_id, chore_id);
+CREATE INDEX IF NOT EXISTS assignments_monthly
+    ON assignments(week) WHERE monthly;
+-- Counts from before the first imported week, so the view matches the sheet
+CREATE TABLE IF NOT EXISTS history_offsets (
+    employee_id INTEGER NOT NULL REFERENCES employees(id),
+    chore_id INTEGER NOT NULL REFERENCES chores(id),
+    count INTEGER NOT NULL,
+    PRIMARY KEY (employee_id, chore_id)
+) WITHOUT ROWID;
+CREATE VIEW IF NOT EXISTS chore_history AS
+    SELECT employee_id, chore_id, SUM(n) AS count FROM (
+        SELECT employee_id, chore_id, count AS n FROM history_offsets
+        UNION ALL
+        SELECT employee_id, chore_id, 1 FROM assignments
+    )
+    GROUP BY employee_id, chore_id;
+"""
+
+
+def connect(db_path):
+    """Open a chore database, creating its tables if needed."""
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(SCHEMA)
+    _add_missing_columns(conn)
+    return conn
+
+
+def _add_missing_columns(conn):
+    """Give a database made before tags and away were kept those columns."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(employees)")}
+    for column in ("tags", "away"):
+        if column not in columns:
+            conn.execute(f"ALTER TABLE employees ADD COLUMN {column} TEXT")
+
+
+def _cell_text(value):
+    """A Tags or Away cell as stored in the database, None if blank."""
+    if isinstance(value, (date, datetime)):
+        return chore_wheel._as_date(value).isoformat()
+    if pd.isna(value):
+        return None
+    return str(value)
+
+
+@contextmanager
+def transaction(conn):
+    """Run a block as one write transaction, rolled back on any error."""
+    # IMMEDIATE takes the write lock up front, so two spins cannot both
+    # read the same last week and then insert the same next one
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def _ids(conn, table):
+    """Map names to ids for the employees or chores table."""
+    return {name: i for i, name in conn.execute(f"SELECT id, name FROM {table}")}
+
+
+def _add_chores(conn, chores):
+    """Insert any chores not yet in the chores table and return all ids."""
+    conn.executemany(
+        "INSERT OR IGNORE INTO chores (name) VALUES (?)",
+        [(chore,) for chore in chores],
+    )
+    return _ids(conn, "chores")
+
+
+def read_history(conn):
+    """The chore_history view as a ChoreHistory, rows and columns by id."""
+    employees = conn.execute("SELECT id, name FROM employees ORDER BY id").fetchall()
+    chores = conn.execute("SELECT id, name FROM chores ORDER BY id").fetchall()
+    history = chore_wheel.ChoreHistory(
+        [name for _, name in employees], [name for _, name in chores]
+    )
+    cells = np.array(
+        conn.execute(
+            "SELECT employee_id, chore_id, count FROM chore_history"
+        ).fetchall(),
+        dtype=np.int64,
+    ).reshape(-1, 3)
+    rows = {i: r for r, (i, _) in enumerate(employees)}
+    cols = {i: c for c, (i, _) in enumerate(chores)}
+    r = np.array([rows[i] for i in cells[:, 0]], dtype=np.int64)
+    c = np.array([cols[i] for i in cells[:, 1]], dtype=np.int64)
+    history.counts[r, c] = cells[:, 2]
+    return history
+
+
+def read_counters(conn):
+    """Week and month counters, as get_week_and_month_counts gives them."""
+    (weeks,) = conn.execute("SELECT COALESCE(MAX(week), 0) FROM assignments").fetchone()
+    (months,) = conn.execute(
+        "SELECT COUNT(DISTINCT week) FROM assignments WHERE monthly"
+    ).fetchone()
+    return weeks, months
+
+
+def read_state(conn):
+    """A FairnessState for the employees who can be given chores."""
+    roster = pd.DataFrame(
+        conn.execute(
+            "SELECT name, tags, away FROM employees"
+            " WHERE position IS NOT NULL AND NOT out ORDER BY position"
+        ).fetchall(),
+        columns=[EMPLOYEE_COLUMN, TAGS_COLUMN, AWAY_COLUMN],
+    )
+    week_count, month_count = read_counters(conn)
+    state = chore_wheel.FairnessState(
+        roster, read_history(conn), week_count, month_count
+    )
+    recent = conn.execute(
+        "SELECT a.week, e.name, c.name FROM assignments a"
+        " JOIN employees e ON e.id = a.employee_id"
+        " JOIN chores c ON c.id = a.chore_id"
+        " WHERE a.week > ? ORDER BY a.week",
+        (week_count - state.window,),
+    ).fetchall()
+    for week in range(week_count - state.window + 1, week_count + 1):
+        chores = {name: chore for w, name, chore in recent if w == week}
+        state.push(roster[EMPLOYEE_COLUMN].map(chores))
+    return state
+
+
+def _insert_week(conn, week, week_chores, month_chores):
+    """Insert one spun week, given {person: chore} for its Week/Month columns."""
+    employee_ids = _ids(conn, "employees")
+    chore_ids = _add_chores(conn, list(week_chores.values()))
+    conn.executemany(
+        "INSERT INTO assignments (week, employee_id, chore_id, monthly)"
+        " VALUES (?, ?, ?, ?)",
+        [
+            (week, employee_ids[person], chore_ids[chore], int(person in month_chores))
+            for person, chore in week_chores.items()
+        ],
+    )
+
+
+def spin(db_path, weeks=1, solver="greedy", log=print, day=None):
+    """Assign weeks straight into the database, one transaction per spin.
+
+    The first week starts on day, today by default, for the Away column.
+    """
+    assign = chore_wheel.SOLVERS[solver]
+    conn = connect(db_path)
+    try:
+        with transaction(conn):
+            state = read_state(conn)
+            main_df = state.roster.copy()
+            for week_day in chore_wheel._week_days(day, weeks):
+                old_cols = set(main_df.columns)
+                main_df, _ = chore_wheel.spin_week(
+                    main_df, state.history, assign, log=log, state=state, day=week_day
+                )
+                new_cols = [col for col in main_df.columns if col not in old_cols]
+                columns = {
+                    col: dict(main_df[[EMPLOYEE_COLUMN, col]].dropna().values)
+                    for col in new_cols
+                }
+                _insert_week(
+                    conn,
+                    state.week_count,
+                    columns[f"Week {state.week_count}"],
+                    columns.get(f"Month {state.month_count}", {}),
+                )
+        log(f"All chores and history saved to {db_path}.")
+    finally:
+        conn.close()
+    return main_df
+
+
+def import_workbook(file_path, db_path, log=print):
+    """Migrate a chore workbook into a new, empty database.
+
+    Only Employee, Out, Tags, Away and the Week/Month columns of Assignments
+    are kept.
+    """
+    main_df, history_df = chore_wheel.load_excel(file_path, log)
+    conn = connect(db_path)
+    try:
+        with transaction(conn):
+            (existing,) = conn.execute("SELECT COUNT(*) FROM employees").fetchone()
+            if existing:
+                raise ValueError(f"{db_path} already holds chore data.")
+            _import_frames(conn, main_df, history_df)
+    finally:
+        conn.close()
+    log(f"Imported {file_path} into {db_path}.")
+
+
+def _import_frames(conn, main_df, history_df):
+    """Insert the rows for import_workbook."""
+    _write_roster(conn, main_df)
+    conn.executemany(
+        "INSERT OR IGNORE INTO employees (name) VALUES (?)",
+        [(person,) for person in history_df[EMPLOYEE_COLUMN].dropna()],
+    )
+
+    # A Month column is spun just before its Week column, whose week it shares
+    history = chore_wheel.ChoreHistory.from_dataframe(history_df)
+    _add_chores(conn, chore_wheel.chore_dtype(history.chores).categories)
+    week, month_chores = 0, {}
+    for col in main_df.columns:
+        if not chore_wheel._is_chore_column(col):
+            continue
+        values = main_df[[EMPLOYEE_COLUMN, col]].dropna()
+        values = dict(zip(values[EMPLOYEE_COLUMN], values[col].astype(object)))
+        if str(col).startswith("Month"):
+            month_chores = values
+            continue
+        week += 1
+        _insert_week(conn, week, {**month_chores, **values}, month_chores)
+        month_chores = {}
+
+    # Whatever the sheet counts beyond the imported weeks becomes an offset
+    employee_ids = _ids(conn, "employees")
+    chore_ids = _ids(conn, "chores")
+    imported = read_history(conn)
+    offsets = []
+    for person, r in history.rows.items():
+        if pd.isna(person):
+            continue
+        imported_row = imported.counts[imported.rows[person]]
+        for chore, c in history.cols.items():
+            extra = int(history.counts[r, c]) - int(imported_row[imported.cols[chore]])
+            if extra:
+                offsets.append((employee_ids[person], chore_ids[chore], extra))
+    conn.executemany(
+        "INSERT INTO history_offsets (employee_id, chore_id, count) VALUES (?, ?, ?)",
+        offsets,
+    )
+
+
+def _roster_rows(main_df):
+    """(name, position, out, tags, away) for each employee on Assignments."""
+    people = list(dict.fromkeys(main_df[EMPLOYEE_COLUMN].dropna()))
+    out = set()
+    if OUT_COLUMN in main_df.columns:
+        out = set(
+            main_df.loc[chore_wheel.out_flags(main_df[OUT_COLUMN]), EMPLOYEE_COLUMN]
+        )
+    cells = {}
+    for column in (TAGS_COLUMN, AWAY_COLUMN):
+        cells[column] = {}
+        if column in main_df.columns:
+            values = main_df[[EMPLOYEE_COLUMN, column]].dropna(subset=[EMPLOYEE_COLUMN])
+            # The first row wins for a name listed twice, as for positions
+            values = values.drop_duplicates(EMPLOYEE_COLUMN)
+            cells[column] = dict(zip(values[EMPLOYEE_COLUMN], values[column]))
+    return [
+        (
+            person,
+            i,
+            int(person in out),
+            _cell_text(cells[TAGS_COLUMN].get(person)),
+            _cell_text(cells[AWAY_COLUMN].get(person)),
+        )
+        for i, person in enumerate(people)
+    ]
+
+
+def _write_roster(conn, main_df):
+    """Make Assignments' employees the roster, in its order.
+
+    New people are added, listed ones get the sheet's Out, Tags and Away,
+    and anyone no longer listed keeps their history but gets no chores.
+    """
+    conn.execute("UPDATE employees SET position = NULL")
+    conn.executemany(
+        "INSERT INTO employees (name, position, out, tags, away)"
+        " VALUES (?, ?, ?, ?, ?)"
+        " ON CONFLICT (name) DO UPDATE SET position = excluded.position,"
+        " out = excluded.out, tags = excluded.tags, away = excluded.away",
+        _roster_rows(main_df),
+    )
+
+
+def update_roster(file_path, db_path, log=print):
+    """Replace a database's roster with a workbook's Assignments sheet.
+
+    Only Employee, Out, Tags and Away are read, so an exported workbook can
+    be edited to add, remove or mark people out and read back in; its
+    Week/Month columns and Chore History are ignored.
+    """
+    main_df, _ = chore_wheel.load_excel(file_path, log)
+    conn = connect(db_path)
+    try:
+        with transaction(conn):
+            _write_roster(conn, main_df)
+            (listed,) = conn.execute(
+                "SELECT COUNT(*) FROM employees WHERE position IS NOT NULL"
+            ).fetchone()
+    finally:
+        conn.close()
+    log(f"Updated the roster of {db_path} from {file_path}: {listed} employees.")
+
+
+def read_frames(conn):
+    """Rebuild the Assignments frame and ChoreHistory from the database."""
+    employees = conn.execute(
+        "SELECT id, name, out, tags, away FROM employees"
+        " WHERE position IS NOT NULL ORDER BY position"
+    ).fetchall()
+    main_df = pd.DataFrame(
+        [name for _, name, _, _, _ in employees], columns=[EMPLOYEE_COLUMN]
+    )
+    if any(out for _, _, out, _, _ in employees):
+        main_df[OUT_COLUMN] = [bool(out) or None for _, _, out, _, _ in employees]
+    if any(tags for _, _, _, tags, _ in employees):
+        main_df[TAGS_COLUMN] = [tags for _, _, _, tags, _ in employees]
+    if any(away for _, _, _, _, away in employees):
+        main_df[AWAY_COLUMN] = [away for _, _, _, _, away in employees]
+
+    rows = pd.DataFrame(
+        conn.execute(
+            "SELECT a.week, a.employee_id, c.name, a.monthly FROM assignments a"
+            " JOIN chores c ON c.id = a.chore_id ORDER BY a.week"
+        ).fetchall(),
+        columns=["week", "employee_id", "chore", "monthly"],
+    )
+    ids = pd.Series([i for i, _, _, _, _ in employees])
+    columns = {}
+    month = 0
+    for week, spun in rows.groupby("week", sort=True):
+        monthly = spun[spun["monthly"] == 1]
+        if len(monthly):
+            month += 1
+            chores = dict(zip(monthly["employee_id"], monthly["chore"]))
+            columns[f"Month {month}"] = ids.map(chores)
+        columns[f"Week {week}"] = ids.map(dict(zip(spun["employee_id"], spun["chore"])))
+    if columns:
+        spun = pd.DataFrame(columns)
+        main_df = pd.concat([main_df, spun], axis=1)
+    return chore_wheel.encode_assignment_columns(main_df), read_history(conn)
+
+
+def export_workbook(db_path, file_path, log=print):
+    """Write the database out as a chore workbook."""
+    conn = connect(db_path)
+    try:
+        main_df, history = read_frames(conn)
+    finally:
+        conn.close()
+    chore_wheel.save_workbook(file_path, main_df, history)
+    log(f"Exported {db_path} to {file_path}.")
+
+
+def parse_args(argv=None):
+    """Parse command line options for the database commands."""
+    parser = argparse.ArgumentParser(description="Keep chores in SQLite.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    command = commands.add_parser("import", help="migrate a workbook into a database")
+    command.add_argument("workbook")
+    command.add_argument("db")
+    command = commands.add_parser("export", help="write a database out as a workbook")
+    command.add_argument("db")
+    command.add_argument("workbook")
+    command = commands.add_parser(
+        "roster", help="read employees, Out, Tags and Away from a workbook"
+    )
+    command.add_argument("workbook")
+    command.add_argument("db")
+    command = commands.add_parser("spin", help="assign chores in a database")
+    command.add_argument("db")
+    command.add_argument(
+        "--solver", choices=sorted(chore_wheel.SOLVERS), default="greedy"
+    )
+    command.add_argument("--weeks", type=int, default=1)
+    command.add_argument(
+        "--date",
+        type=date.fromisoformat,
+        help="first day (YYYY-MM-DD) of the week to assign, for the Away column;"
+        " today by default",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run one database command."""
+    args = parse_args(argv)
+    if args.command == "import":
+        if not os.path.exists(args.workbook):
+            raise FileNotFoundError(f"{args.workbook} does not exist.")
+        import_workbook(args.workbook, args.db)
+    elif args.command == "roster":
+        if not os.path.exists(args.workbook):
+            raise FileNotFoundError(f"{args.workbook} does not exist.")
+        update_roster(args.workbook, args.db)
+    elif args.command == "export":
+        export_workbook(args.db, args.workbook)
+    else:
+        spin(args.db, args.weeks, args.solver, day=args.date)
+
+
+if __name__ == "__main__":
+    main()
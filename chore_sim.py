@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+
+"""Simulate many years of chore wheel spins to compare chore settings.
+
+Every trial starts from an empty workbook and spins week after week with
+the same rules as chore_wheel: monthly chores on the weeks chore_wheel
+gives them, monthly people skipped for weekly chores, chores with the
+fewest eligible people filled first, the fewest past turns at a chore
+first, nobody repeating a chore within REPEAT_WINDOW weeks unless there
+is no one else, and nobody given a chore they lack a required tag for.
+All trials are spun together as NumPy arrays, so a thousand years take
+seconds.
+
+    python chore_sim.py --trials 1000 --weeks 52 --people 100
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+import chore_wheel
+
+
+def _pick(key, needed):
+    """Per trial, the needed columns with the smallest finite key.
+
+    Returns (trials, needed) column indices and a mask of the real picks.
+    """
+    needed = min(needed, key.shape[1])
+    if needed == 0:
+        return np.zeros((len(key), 0), dtype=np.int64), np.zeros((len(key), 0), bool)
+    picks = np.argpartition(key, needed - 1, axis=1)[:, :needed]
+    return picks, np.isfinite(np.take_along_axis(key, picks, axis=1))
+
+
+def simulate(
+    trials=1000,
+    weeks=52,
+    people=100,
+    seed=0,
+    weekly=None,
+    monthly=None,
+    window=None,
+    out_rate=0.0,
+    requirements=None,
+    tag_rate=0.25,
+):
+    """Spin weeks for every trial at once and measure how fair it was.
+
+    weekly and monthly default to WEEKLY_CHORES and MONTHLY_CHORES, window
+    to REPEAT_WINDOW and requirements to CHORE_REQUIREMENTS. Each person is
+    independently Out for a week with probability out_rate, and holds each
+    required tag for the whole trial with probability tag_rate. Returns a
+    dict of fairness metrics averaged over the trials.
+    """
+    weekly = chore_wheel.WEEKLY_CHORES if weekly is None else weekly
+    monthly = chore_wheel.MONTHLY_CHORES if monthly is None else monthly
+    window = chore_wheel.REPEAT_WINDOW if window is None else window
+    if requirements is None:
+        requirements = chore_wheel.CHORE_REQUIREMENTS
+    chores = list(weekly)
+    for due in monthly.values():
+        chores += list(due)
+    codes = {chore: c for c, chore in enumerate(dict.fromkeys(chores))}
+
+    rng = np.random.default_rng(seed)
+    # (trials, people, chores) bool, True where a person has every tag needed
+    allowed = np.ones((trials, people, len(codes)), dtype=bool)
+    tags = {tag.lower() for needs in requirements.values() for tag in needs}
+    holders = {tag: rng.random((trials, people)) < tag_rate for tag in sorted(tags)}
+    for chore, needs in requirements.items():
+        if chore in codes:
+            for tag in needs:
+                allowed[:, :, codes[chore]] &= holders[tag.lower()]
+
+    counts = np.zeros((trials, people, len(codes)), dtype=np.int32)
+    # Ring buffer of each person's chore code for the last window weeks
+    recent = np.full((trials, window, people), -1, dtype=np.int16)
+    trial = np.arange(trials)
+    rows = trial[:, None]
+    slots = assigned = fallback = repeats = 0
+
+    for week_number in range(1, weeks + 1):
+        week = np.full((trials, people), -1, dtype=np.int16)
+        available = rng.random((trials, people)) >= out_rate
+        for due in (chore_wheel.monthly_chores_for_week(week_number, monthly), weekly):
+            # One shuffle per pass, as assign_chores_fairly shuffles once
+            noise = rng.random((trials, people))
+            if not due:
+                continue
+            due_codes = np.array([codes[chore] for chore in due])
+            due_needed = np.array(list(due.values()))
+            # Per trial, the chores with the fewest eligible people go first
+            eligible = (allowed[:, :, due_codes] & available[:, :, None]).sum(axis=1)
+            order = np.argsort(eligible, axis=1, kind="stable")
+            for k in range(len(due)):
+                c = due_codes[order[:, k]]
+                needed = due_needed[order[:, k]]
+                free = available & (week < 0) & allowed[trial, :, c]
+                blocked = (recent == c[:, None, None]).any(axis=1)
+                counts_c = counts[trial, :, c]
+
+                # Fewest turns first; the shuffle order breaks ties
+                key = np.where(free & ~blocked, counts_c + noise, np.inf)
+                picks, ok = _pick(key, needed.max())
+                ok &= np.arange(picks.shape[1]) < needed[:, None]
+                chosen = np.zeros((trials, people), dtype=bool)
+                chosen[np.broadcast_to(rows, picks.shape)[ok], picks[ok]] = True
+
+                # Short of people: anyone left, even if they just did it
+                short = needed - ok.sum(axis=1)
+                if short.any():
+                    key = np.where(free & ~chosen, rng.random(key.shape), np.inf)
+                    extra, extra_ok = _pick(key, needed.max())
+                    extra_ok &= np.arange(extra.shape[1]) < short[:, None]
+                    extra_rows = np.broadcast_to(rows, extra.shape)[extra_ok]
+                    chosen[extra_rows, extra[extra_ok]] = True
+                    fallback += int(extra_ok.sum())
+                    repeats += int(blocked[extra_rows, extra[extra_ok]].sum())
+
+                week = np.where(chosen, c[:, None].astype(week.dtype), week)
+                counts[trial, :, c] = counts_c + chosen
+                slots += int(needed.sum())
+                assigned += int(chosen.sum())
+        if window:
+            recent[:, (week_number - 1) % window] = week
+
+    totals = counts.sum(axis=2)
+    return {
+        "trials": trials,
+        "weeks": weeks,
+        "people": people,
+        "window": window,
+        "out_rate": out_rate,
+        "chores_per_person_mean": float(totals.mean()),
+        "chores_per_person_variance": float(totals.var(axis=1).mean()),
+        "chores_per_person_spread": float(np.ptp(totals, axis=1).mean()),
+        "per_chore_variance": float(counts.var(axis=1).mean()),
+        "repeat_rate": repeats / max(assigned, 1),
+        "fallback_rate": fallback / max(assigned, 1),
+        "unfilled_rate": (slots - assigned) / max(slots, 1),
+    }
+
+
+def parse_args(argv=None):
+    """Parse command line options for a simulation."""
+    parser = argparse.ArgumentParser(description="Simulate chore wheel fairness.")
+    parser.add_argument("--trials", type=int, default=1000)
+    parser.add_argument("--weeks", type=int, default=52)
+    parser.add_argument("--people", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--window",
+        type=int,
+        help=f"weeks before a chore may repeat (default {chore_wheel.REPEAT_WINDOW})",
+    )
+    parser.add_argument(
+        "--out-rate",
+        type=float,
+        default=0.0,
+        help="chance that a person is Out in any given week",
+    )
+    parser.add_argument(
+        "--tag-rate",
+        type=float,
+        default=0.25,
+        help="chance that a person holds each tag CHORE_REQUIREMENTS asks for",
+    )
+    parser.add_argument("--json", action="store_true", help="print JSON only")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run a simulation and print its fairness metrics."""
+    args = parse_args(argv)
+    start = time.perf_counter()
+    result = simulate(
+        args.trials,
+        args.weeks,
+        args.people,
+        args.seed,
+        window=args.window,
+        out_rate=args.out_rate,
+        tag_rate=args.tag_rate,
+    )
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    for name, value in result.items():
+        if isinstance(value, float):
+            value = f"{value:.4f}"
+        print(f"{name:<28} {value}")
+
+
+if __name__ == "__main__":
+    main()
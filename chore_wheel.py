@@ -2,17 +2,77 @@
 
 """docstring goes here."""
 
+import time
+
+_import_start = time.perf_counter()
+
+import argparse
+import glob
+import hashlib
+import importlib
+import json
 import os
+import pickle
 import random
-import pandas as pd
-from openpyxl import load_workbook
-from openpyxl.utils import get_column_letter
+import sys
+import types
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from datetime import date, datetime, timedelta
+
+# Seconds spent importing chore_wheel and each module from lazy_module
+IMPORT_TIMES = {}
+
+
+class _LazyModule(types.ModuleType):
+    """Stand-in for a module that imports it on first attribute access."""
+
+    def __getattr__(self, attr):
+        start = time.perf_counter()
+        module = importlib.import_module(self.__name__)
+        IMPORT_TIMES.setdefault(self.__name__, time.perf_counter() - start)
+        # Later lookups find attributes here without calling __getattr__
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+
+_lazy_modules = {}
+
+
+def lazy_module(name):
+    """A module that is only imported once one of its attributes is used."""
+    if name in sys.modules:
+        return sys.modules[name]
+    return _lazy_modules.setdefault(name, _LazyModule(name))
+
+
+# The data libraries take most of the start-up time, so commands and the
+# editor window that do not need them yet never wait for them
+np = lazy_module("numpy")
+pd = lazy_module("pandas")
+openpyxl = lazy_module("openpyxl")
+
+
+def load_data_libraries():
+    """Import NumPy, pandas and openpyxl now instead of on first use."""
+    for module in (np, pd, openpyxl):
+        getattr(module, "__version__")
+
+
+def import_report():
+    """Import times of chore_wheel and the data libraries, like -X importtime."""
+    lines = ["import time: cumulative [us] | imported package"]
+    for name, seconds in IMPORT_TIMES.items():
+        lines.append(f"import time: {round(seconds * 1e6):>16} | {name}")
+    return lines
 
 
 # --- CONFIGURATION ---
 EXCEL_FILE = "ChoreAssignments.xlsx"
 EMPLOYEE_COLUMN = "Employee"
 OUT_COLUMN = "Out"
+TAGS_COLUMN = "Tags"
+AWAY_COLUMN = "Away"
 HISTORY_SHEET = "Chore History"
 ASSIGNMENT_SHEET = "Assignments"
 
@@ -38,47 +98,380 @@ MONTHLY_CHORES = {
     0: {"Growth Chamber Shower": 4},
     2: {"Fridges": 3},
 }
+
+# Chore: tags someone needs in their Tags cell to be given it,
+# e.g. {"Growth Chamber Shower": ["Growth Chamber"]}
+CHORE_REQUIREMENTS = {}
+
+# Parsed sheets are cached beside the workbook in .<workbook><suffix>
+CACHE_SUFFIX = ".cache"
+
+# Fairness state (counts, recent weeks, counters) is kept in .<workbook><suffix>
+STATE_SUFFIX = ".state"
+
+# Nobody repeats a chore they did within this many weeks, unless unavoidable
+REPEAT_WINDOW = 1
+
+# Extra cost the optimal solver adds for repeating a recent chore
+LAST_CHORE_PENALTY = 1000
+
+# Append a JSON timing record per run to this file (None to disable)
+METRICS_LOG = None
 # ----------------------
 
 
-def load_excel(file_path):
+class SpinMetrics:
+    """Phase timings and counters collected over one run."""
+
+    def __init__(self):
+        """Start an empty record stamped with the current time."""
+        self.started = datetime.now().isoformat(timespec="seconds")
+        self.phases = {}
+        self.counters = {}
+
+    @contextmanager
+    def phase(self, name):
+        """Add the time spent inside the with block to phase name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    def count(self, name, n=1):
+        """Add n to counter name."""
+        self.counters[name] = self.counters.get(name, 0) + int(n)
+
+    def record(self, **fields):
+        """The run as a JSON-serializable dict, with extra fields merged in."""
+        return {
+            "started": self.started,
+            **fields,
+            "phases": {name: round(secs, 6) for name, secs in self.phases.items()},
+            "counters": dict(self.counters),
+        }
+
+    def summary(self):
+        """Human readable lines for the phase breakdown and counters."""
+        lines = ["Phase breakdown:"]
+        lines += [f"  {name:<10} {secs:8.3f}s" for name, secs in self.phases.items()]
+        lines += [f"  {name}: {value}" for name, value in self.counters.items()]
+        return lines
+
+    def write(self, log_path, **fields):
+        """Append the run's record to log_path as one JSON line."""
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(self.record(**fields)) + "\n")
+
+
+_active_metrics = None
+
+
+@contextmanager
+def instrument(metrics):
+    """Collect timings and counters from chore_wheel calls into metrics."""
+    global _active_metrics
+    previous, _active_metrics = _active_metrics, metrics
+    try:
+        yield metrics
+    finally:
+        _active_metrics = previous
+
+
+def _phase(name):
+    """Time a block into the active metrics, if instrumentation is on."""
+    if _active_metrics is None:
+        return nullcontext()
+    return _active_metrics.phase(name)
+
+
+def _count(name, n=1):
+    """Bump a counter on the active metrics, if instrumentation is on."""
+    if _active_metrics is not None:
+        _active_metrics.count(name, n)
+
+
+def _load_pickle(f):
+    """Unpickle frames and arrays, letting pd import pandas so it is timed."""
+    getattr(pd, "__version__")
+    return pickle.load(f)
+
+
+def _cache_path(file_path):
+    """Sidecar cache file kept beside a workbook."""
+    folder, name = os.path.split(os.path.abspath(file_path))
+    return os.path.join(folder, f".{name}{CACHE_SUFFIX}")
+
+
+def workbook_fingerprint(file_path):
+    """Identify a workbook's exact contents by path, size, mtime and hash."""
+    stat = os.stat(file_path)
+    digest = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return (
+        os.path.abspath(file_path),
+        stat.st_size,
+        stat.st_mtime_ns,
+        digest.hexdigest(),
+    )
+
+
+def _fingerprint_matches(file_path, size, mtime, digest):
+    """Whether a workbook still has the size, mtime and hash recorded for it.
+
+    Matching size and mtime are trusted without reading the file. Only a
+    changed mtime costs a hash, so a workbook that was touched or copied
+    but not changed still matches.
+    """
+    stat = os.stat(file_path)
+    if stat.st_size != size:
+        return False
+    if stat.st_mtime_ns == mtime:
+        return True
+    return digest == workbook_fingerprint(file_path)[3]
+
+
+def read_cached_sheets(file_path):
+    """Parsed sheets from the sidecar cache, or None if it is missing or stale.
+
+    The cache is stale once the workbook's size or content hash differs
+    from when it was written, e.g. after the workbook was edited in Excel.
+    """
+    try:
+        with open(_cache_path(file_path), "rb") as f:
+            cached = _load_pickle(f)
+        path, size, mtime, digest = cached["fingerprint"]
+        if path != os.path.abspath(file_path):
+            return None
+        if not _fingerprint_matches(file_path, size, mtime, digest):
+            return None
+        return cached["sheets"]
+    except (OSError, pickle.UnpicklingError, EOFError, KeyError, ValueError):
+        return None
+
+
+def write_sheet_cache(file_path, sheets):
+    """Store parsed sheets beside the workbook as it is now on disk."""
+    cached = {"fingerprint": workbook_fingerprint(file_path), "sheets": sheets}
+    try:
+        with open(_cache_path(file_path), "wb") as f:
+            pickle.dump(cached, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass  # A read-only folder just means no cache
+
+
+def read_workbook(file_path):
+    """Every sheet of a workbook, from the sidecar cache when it is valid."""
+    sheets = read_cached_sheets(file_path)
+    if sheets is None:
+        sheets = pd.read_excel(file_path, sheet_name=None)
+        if ASSIGNMENT_SHEET in sheets:
+            sheets[ASSIGNMENT_SHEET] = encode_assignment_columns(
+                sheets[ASSIGNMENT_SHEET]
+            )
+        write_sheet_cache(file_path, sheets)
+    return sheets
+
+
+def load_excel(file_path, log=print):
     """docstring goes here."""
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"{file_path} does not exist.")
 
-    with pd.ExcelFile(file_path) as xls:
-        sheet_names = xls.sheet_names
+    with _phase("load"):
+        main_df, history_df = select_sheets(read_workbook(file_path), log)
+    _count("rows_read", len(main_df) + len(history_df))
+    _count("columns_read", len(main_df.columns) + len(history_df.columns))
+    return main_df, history_df
+
 
-        # Load Chore History sheet if it exists
-        try:
-            history_df = pd.read_excel(xls, sheet_name=HISTORY_SHEET).fillna(0)
-        except ValueError:
-            history_df = pd.DataFrame(columns=[EMPLOYEE_COLUMN])
+def select_sheets(sheets, log=print):
+    """Pick the Assignments and Chore History frames out of a workbook's sheets."""
+    # Load Chore History sheet if it exists
+    if HISTORY_SHEET in sheets:
+        history_df = sheets[HISTORY_SHEET].fillna(0)
+    else:
+        history_df = pd.DataFrame(columns=[EMPLOYEE_COLUMN])
 
-        # Load Assignments sheet if it exists
-        if ASSIGNMENT_SHEET in sheet_names:
-            main_df = pd.read_excel(xls, sheet_name=ASSIGNMENT_SHEET)
-        else:
-            # Look for a sheet with an Employee column to base the new Assignments sheet on
-            for name in sheet_names:
-                temp_df = pd.read_excel(xls, sheet_name=name)
-                if EMPLOYEE_COLUMN in temp_df.columns:
-                    main_df = temp_df.copy()  # Preserve all columns
-                    print(
-                        f"'{ASSIGNMENT_SHEET}' sheet not found. Created from sheet '{name}' with all columns preserved."
-                    )
-                    break
-                raise ValueError(
-                    f"No sheet with a '{EMPLOYEE_COLUMN}' column found to create '{ASSIGNMENT_SHEET}'."
+    # Load Assignments sheet if it exists
+    if ASSIGNMENT_SHEET in sheets:
+        main_df = sheets[ASSIGNMENT_SHEET]
+    else:
+        # Look for a sheet with an Employee column to base the new Assignments sheet on
+        for name, temp_df in sheets.items():
+            if EMPLOYEE_COLUMN in temp_df.columns:
+                main_df = temp_df.copy()  # Preserve all columns
+                log(
+                    f"'{ASSIGNMENT_SHEET}' sheet not found. Created from sheet '{name}' with all columns preserved."
                 )
+                break
+        else:
+            raise ValueError(
+                f"No sheet with a '{EMPLOYEE_COLUMN}' column found to create '{ASSIGNMENT_SHEET}'."
+            )
+
+    return encode_assignment_columns(main_df), history_df
+
+
+def _is_chore_column(col):
+    """Whether a header names a Week N or Month N assignment column."""
+    return isinstance(col, str) and (col.startswith("Week") or col.startswith("Month"))
+
+
+def chore_dtype(extra=()):
+    """Categorical dtype shared by assignment columns.
+
+    Codes follow WEEKLY_CHORES then MONTHLY_CHORES, then any extra chores
+    found in a workbook that are no longer configured.
+    """
+    chores = list(WEEKLY_CHORES)
+    for monthly in MONTHLY_CHORES.values():
+        chores += list(monthly)
+    chores += [chore for chore in extra if pd.notna(chore)]
+    return pd.CategoricalDtype(list(dict.fromkeys(chores)))
+
+
+def as_chore_categorical(values):
+    """values as a Series over the shared chore dictionary."""
+    values = pd.Series(values)
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        extra = values.cat.categories
+    else:
+        extra = values.dropna().unique()
+    return values.astype(chore_dtype(extra))
+
+
+def encode_assignment_columns(df):
+    """A copy of df with every Week/Month column held as chore codes."""
+    cols = [col for col in df.columns if _is_chore_column(col)]
+    if not cols:
+        return df
+    extra = []
+    for col in cols:
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            extra += list(values.cat.categories)
+        else:
+            extra += list(values.dropna().unique())
+    dtype = chore_dtype(extra)
+    return df.assign(**{col: df[col].astype(dtype) for col in cols})
+
+
+def decode_assignment_columns(df):
+    """A copy of df with coded columns turned back into plain values."""
+    cols = [col for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)]
+    if not cols:
+        return df
+    return df.assign(**{col: df[col].astype(object) for col in cols})
+
+
+def _roster_columns(columns):
+    """Employee plus whichever of the Out, Tags and Away columns exist."""
+    optional = [OUT_COLUMN, TAGS_COLUMN, AWAY_COLUMN]
+    return [EMPLOYEE_COLUMN] + [col for col in optional if col in columns]
 
-    return main_df, history_df
 
+def _spin_columns(headers):
+    """The Assignments columns a spin reads: the roster and recent weeks."""
+    return _roster_columns(headers) + _recent_week_columns(headers)
 
-def get_week_and_month_counts(df):
+
+def _recent_week_columns(columns, weeks=None):
+    """The last REPEAT_WINDOW (or weeks) Week columns, oldest first."""
+    weeks = REPEAT_WINDOW if weeks is None else weeks
+    week_cols = [col for col in columns if str(col).startswith("Week")]
+    return week_cols[-weeks:] if weeks > 0 else []
+
+
+def load_spin_columns(file_path):
+    """Stream just the columns a spin reads from the workbook."""
+    with _phase("load"):
+        loaded = _load_spin_columns(file_path)
+    if loaded is not None:
+        main_df, history_df, headers = loaded
+        _count("rows_read", len(main_df) + len(history_df))
+        _count("columns_read", len(main_df.columns) + len(history_df.columns))
+        _count("columns_skipped", len(headers) - len(main_df.columns))
+    return loaded
+
+
+def _load_spin_columns(file_path):
+    """Load the columns for load_spin_columns.
+
+    Opens the workbook read-only and keeps only the roster columns and the
+    last REPEAT_WINDOW Week columns of Assignments, plus the Chore History
+    sheet; a valid sidecar cache is sliced instead of opening the workbook.
+    Returns (main_df, history_df, headers) where headers lists every
+    Assignments column, or None if there is no Assignments sheet to stream.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"{file_path} does not exist.")
+
+    sheets = read_cached_sheets(file_path)
+    if sheets is not None:
+        # A valid cache is already parsed, so slice it instead of streaming
+        main_df = sheets.get(ASSIGNMENT_SHEET)
+        if main_df is None or EMPLOYEE_COLUMN not in main_df.columns:
+            return None
+        headers = list(main_df.columns)
+        history_df = sheets.get(HISTORY_SHEET, pd.DataFrame(columns=[EMPLOYEE_COLUMN]))
+        main_df = encode_assignment_columns(main_df[_spin_columns(headers)])
+        return main_df, history_df.fillna(0), headers
+
+    wb = openpyxl.load_workbook(file_path, read_only=True)
+    try:
+        if ASSIGNMENT_SHEET not in wb.sheetnames:
+            return None
+        rows = wb[ASSIGNMENT_SHEET].iter_rows(values_only=True)
+        headers = list(next(rows, ()))
+        while headers and headers[-1] is None:
+            headers.pop()
+        if EMPLOYEE_COLUMN not in headers:
+            return None
+        keep = _spin_columns(headers)
+        idx = [headers.index(col) for col in keep]
+        data = [
+            [row[i] if i < len(row) else None for i in idx]
+            for row in rows
+            if any(value is not None for value in row)
+        ]
+        main_df = encode_assignment_columns(pd.DataFrame(data, columns=keep))
+
+        if HISTORY_SHEET in wb.sheetnames:
+            rows = wb[HISTORY_SHEET].iter_rows(values_only=True)
+            history_cols = [col for col in next(rows, ()) if col is not None]
+            data = [
+                row[: len(history_cols)]
+                for row in rows
+                if any(value is not None for value in row)
+            ]
+            history_df = pd.DataFrame(data, columns=history_cols).fillna(0)
+        else:
+            history_df = pd.DataFrame(columns=[EMPLOYEE_COLUMN])
+    finally:
+        wb.close()
+
+    return main_df, history_df, headers
+
+
+def merge_assignment_columns(full_df, spin_df):
+    """Copy columns added to a streamed frame onto the full Assignments frame."""
+    for col in spin_df.columns:
+        if col not in full_df.columns:
+            chores = dict(zip(spin_df[EMPLOYEE_COLUMN], spin_df[col]))
+            full_df[col] = as_chore_categorical(full_df[EMPLOYEE_COLUMN].map(chores))
+    return full_df
+
+
+def get_week_and_month_counts(df, columns=None):
     """docstring goes here."""
-    week_cols = [col for col in df.columns if col.startswith("Week")]
-    month_cols = [col for col in df.columns if col.startswith("Month")]
+    if columns is None:
+        columns = df.columns
+    week_cols = [col for col in columns if str(col).startswith("Week")]
+    month_cols = [col for col in columns if str(col).startswith("Month")]
     return len(week_cols), len(month_cols)
 
 
@@ -93,89 +486,686 @@ def get_last_chore_assignments(df):
     return dict(zip(df[EMPLOYEE_COLUMN], df[last_col]))
 
 
-def get_available_people(df):
-    """docstring goes here."""
-    if OUT_COLUMN in df.columns:
-        return not df[df[OUT_COLUMN]][EMPLOYEE_COLUMN].tolist()
-    return df[EMPLOYEE_COLUMN].tolist()
+def get_recent_chore_assignments(df, weeks=None):
+    """Each person's set of chores from the last REPEAT_WINDOW Week columns."""
+    recent = {}
+    for col in _recent_week_columns(df.columns, weeks):
+        for person, chore in zip(df[EMPLOYEE_COLUMN], df[col]):
+            if pd.notna(chore):
+                recent.setdefault(person, set()).add(chore)
+    return recent
 
 
-def assign_chores_fairly(df, chores, excluded_people, last_assignments, history_df):
-    """docstring goes here."""
-    available = [p for p in get_available_people(df) if p not in excluded_people]
-    random.shuffle(available)
-    assignments = {}
-    used = set()
+def _out_value(value):
+    """Whether one Out cell marks its person as out."""
+    if isinstance(value, str):
+        return value.strip().lower() == "true"
+    return pd.notna(value) and value == 1
 
-    for chore, needed in chores.items():
-        eligible = []
-        for person in available:
-            if last_assignments.get(person) == chore or person in used:
+
+def _out_value_false(value):
+    """Whether one Out cell clearly marks its person as in."""
+    if isinstance(value, str):
+        return value.strip().lower() == "false"
+    return pd.notna(value) and value == 0
+
+
+def out_flags(values):
+    """Bool array, True for each Out cell that marks its person as out.
+
+    Excel's TRUE arrives as a bool, or as 1.0 once pandas reads it in a
+    column that also has blanks; True typed as text is a string.
+    """
+    return np.fromiter(map(_out_value, values), dtype=bool, count=len(values))
+
+
+def _out_mask(df):
+    """Bool array, True for the rows marked Out."""
+    if OUT_COLUMN not in df.columns:
+        return np.zeros(len(df), dtype=bool)
+    return out_flags(df[OUT_COLUMN])
+
+
+def parse_tags(value):
+    """The lowercase tags in a comma separated Tags cell."""
+    if pd.isna(value):
+        return set()
+    return {tag.strip().lower() for tag in str(value).split(",") if tag.strip()}
+
+
+def _as_date(value):
+    """A date from a date, datetime or YYYY-MM-DD string."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value).strip())
+
+
+def parse_absences(value):
+    """The (first, last) day ranges in an Away cell.
+
+    Ranges are comma separated and written "2026-07-01 to 2026-07-14"; a
+    single date is away for that day only. Raises ValueError otherwise.
+    """
+    if isinstance(value, (date, datetime)):
+        return [(_as_date(value), _as_date(value))]
+    if pd.isna(value):
+        return []
+    ranges = []
+    for part in str(value).split(","):
+        if not part.strip():
+            continue
+        first, _, last = part.partition(" to ")
+        first = _as_date(first)
+        last = _as_date(last) if last.strip() else first
+        if last < first:
+            raise ValueError(f"'{part.strip()}' ends before it starts")
+        ranges.append((first, last))
+    return ranges
+
+
+class Eligibility:
+    """Who may take each chore in a week, as NumPy bool masks over the roster.
+
+    available marks the named people who are neither Out nor Away during
+    the week starting on day. Each tag from the Tags column gets a mask of
+    the people carrying it, so a chore's mask is available ANDed with the
+    masks of the tags CHORE_REQUIREMENTS lists for it.
+    """
+
+    def __init__(self, df, day=None, requirements=None):
+        """Compile the masks for df's rows and the week starting on day."""
+        day = date.today() if day is None else day
+        self.requirements = CHORE_REQUIREMENTS if requirements is None else requirements
+        self.names = df[EMPLOYEE_COLUMN].reset_index(drop=True)
+        self.available = self.names.notna().to_numpy() & ~_out_mask(df)
+        self.tags = {}
+        if TAGS_COLUMN in df.columns:
+            for i, cell in enumerate(df[TAGS_COLUMN]):
+                for tag in parse_tags(cell):
+                    mask = self.tags.setdefault(tag, np.zeros(len(df), dtype=bool))
+                    mask[i] = True
+        if AWAY_COLUMN in df.columns:
+            last_day = day + timedelta(days=6)
+            for i, cell in enumerate(df[AWAY_COLUMN]):
+                try:
+                    ranges = parse_absences(cell)
+                except ValueError as e:
+                    raise ValueError(
+                        f"{AWAY_COLUMN} for {self.names[i]} is not understood: {e}"
+                    ) from None
+                if any(first <= last_day and day <= last for first, last in ranges):
+                    self.available[i] = False
+
+    def mask(self, chore):
+        """Bool array of the people who may take chore this week."""
+        mask = self.available.copy()
+        for tag in self.requirements.get(chore, ()):
+            mask &= self.tags.get(tag.lower(), False)
+        return mask
+
+    def matrix(self, chores):
+        """people x chores bool matrix with each chore's mask as a column."""
+        masks = [self.mask(chore) for chore in chores]
+        if not masks:
+            return np.zeros((len(self.names), 0), dtype=bool)
+        return np.stack(masks, axis=1)
+
+    def candidates(self, excluded=()):
+        """Row positions of the available people not in excluded."""
+        taken = self.names.isin(list(excluded)).to_numpy()
+        return np.flatnonzero(self.available & ~taken)
+
+
+def get_available_people(df, day=None):
+    """Named people who are neither Out nor Away in the week starting on day."""
+    eligibility = Eligibility(df, day)
+    return eligibility.names[eligibility.available].tolist()
+
+
+class ChoreHistory:
+    """Employee x chore assignment counts held as an integer NumPy matrix."""
+
+    def __init__(self, employees, chores, counts=None):
+        """Index the matrix rows by employee name and columns by chore."""
+        self.employees = list(employees)
+        self.chores = list(chores)
+        self.rows = {}
+        for i, name in enumerate(self.employees):
+            self.rows.setdefault(name, i)
+        self.cols = {chore: j for j, chore in enumerate(self.chores)}
+        if counts is None:
+            counts = np.zeros((len(self.employees), len(self.chores)), dtype=np.int64)
+        self.counts = np.array(counts, dtype=np.int64)
+        # Cells changed since loading, for patching the saved sheet in place
+        self.changed = set()
+
+    @classmethod
+    def from_dataframe(cls, history_df):
+        """Build the count matrix from a Chore History sheet."""
+        chores = [col for col in history_df.columns if col != EMPLOYEE_COLUMN]
+        counts = (
+            history_df[chores]
+            .apply(pd.to_numeric, errors="coerce")
+            .fillna(0)
+            .to_numpy(dtype=np.int64)
+        )
+        return cls(history_df[EMPLOYEE_COLUMN].tolist(), chores, counts)
+
+    def row_indices(self, people):
+        """Matrix rows for each person, -1 for people with no history."""
+        return np.array([self.rows.get(p, -1) for p in people], dtype=np.int64)
+
+    def chore_counts(self, rows, chore):
+        """Counts of one chore for the given matrix rows, 0 where unknown."""
+        if chore not in self.cols:
+            return np.zeros(len(rows), dtype=np.int64)
+        column = self.counts[:, self.cols[chore]]
+        return np.where(rows >= 0, column[rows], 0)
+
+    def add_employees(self, names):
+        """Append zeroed rows for new employees in one allocation."""
+        for name in names:
+            self.rows[name] = len(self.employees)
+            self.employees.append(name)
+        self.counts = np.pad(self.counts, ((0, len(names)), (0, 0)))
+
+    def add_chores(self, chores):
+        """Append zeroed columns for new chores in one allocation."""
+        for chore in chores:
+            self.cols[chore] = len(self.chores)
+            self.chores.append(chore)
+        self.counts = np.pad(self.counts, ((0, 0), (0, len(chores))))
+
+    def to_dataframe(self):
+        """Rebuild the Chore History sheet from the count matrix."""
+        history_df = pd.DataFrame(self.counts, columns=self.chores)
+        history_df.insert(0, EMPLOYEE_COLUMN, self.employees)
+        return history_df
+
+
+class ChoreStats:
+    """Per-person aggregates kept in step with a ChoreHistory's counts.
+
+    Arrays share the history's row (employee) and column (chore) order:
+    last_week is the week number each person last did each chore (0 for
+    never), last_any the last week they had any chore, streak the run of
+    consecutive weeks with a chore ending at last_any, and longest their
+    longest run. record updates them for one week's assignments only.
+    """
+
+    def __init__(self, last_week, last_any, streak, longest):
+        """Wrap existing arrays; use empty or from_frame to build them."""
+        self.last_week = last_week
+        self.last_any = last_any
+        self.streak = streak
+        self.longest = longest
+
+    @classmethod
+    def empty(cls, history):
+        """Stats for a history with no weeks recorded yet."""
+        people, chores = history.counts.shape
+        zeros = np.zeros(people, dtype=np.int32)
+        return cls(
+            np.zeros((people, chores), dtype=np.int32),
+            zeros,
+            zeros.copy(),
+            zeros.copy(),
+        )
+
+    @classmethod
+    def from_frame(cls, main_df, history):
+        """Build the stats by scanning every Week/Month column once.
+
+        A Month column belongs to the week of the Week column after it.
+        People and chores missing from history are left out.
+        """
+        stats = cls.empty(history)
+        rows = history.row_indices(main_df[EMPLOYEE_COLUMN])
+        week = 0
+        for col in main_df.columns:
+            if not _is_chore_column(col):
                 continue
-            # Get chore count or default to 0
-            if (
-                chore in history_df.columns
-                and person in history_df[EMPLOYEE_COLUMN].values
-            ):
-                count = history_df.loc[
-                    history_df[EMPLOYEE_COLUMN] == person, chore
-                ].values[0]
-            else:
-                count = 0
-            eligible.append((person, count))
-        eligible.sort(key=lambda x: x[1])
-
-        selected = []
-        for person, _ in eligible:
-            if len(selected) < needed:
-                selected.append(person)
-                used.add(person)
+            cols = main_df[col].astype(object).map(history.cols).to_numpy(dtype=float)
+            known = (rows >= 0) & ~np.isnan(cols)
+            stats.record(rows[known], cols[known].astype(np.int64), week + 1)
+            week += str(col).startswith("Week")
+        return stats
+
+    def fit(self, history):
+        """Pad with zeros for employees and chores added to history."""
+        people, chores = history.counts.shape
+        extra_people = people - len(self.last_any)
+        extra_chores = chores - self.last_week.shape[1]
+        if extra_people or extra_chores:
+            self.last_week = np.pad(
+                self.last_week, ((0, extra_people), (0, extra_chores))
+            )
+            self.last_any = np.pad(self.last_any, (0, extra_people))
+            self.streak = np.pad(self.streak, (0, extra_people))
+            self.longest = np.pad(self.longest, (0, extra_people))
+
+    def record(self, rows, cols, week):
+        """Note that history rows did chore cols in week."""
+        self.last_week[rows, cols] = week
+        people = np.unique(rows)
+        last = self.last_any[people]
+        streak = np.where(last == week - 1, self.streak[people] + 1, 1)
+        # A second call for the same week (monthly, then weekly) keeps the run
+        self.streak[people] = np.where(last == week, self.streak[people], streak)
+        self.last_any[people] = week
+        self.longest[people] = np.maximum(self.longest[people], self.streak[people])
+
+    def current_streaks(self, rows, week):
+        """Runs still going in week for the given history rows, 0 if broken."""
+        return np.where(self.last_any[rows] == week, self.streak[rows], 0)
+
+
+def _state_path(file_path):
+    """Sidecar fairness state file kept beside a workbook."""
+    folder, name = os.path.split(os.path.abspath(file_path))
+    return os.path.join(folder, f".{name}{STATE_SUFFIX}")
+
+
+class FairnessState:
+    """Everything a spin needs to be fair, kept compact between runs.
+
+    Holds the roster (Employee, Out, Tags and Away), the ChoreHistory
+    counts, the Week/Month counters and a ring buffer of the last
+    REPEAT_WINDOW weeks' assignments. The ring is a (window, people) int32
+    array of chore codes, 0 for no chore and otherwise the chore's history
+    column + 1, with head pointing at the oldest week. stats holds the
+    ChoreStats when they were built from every Week column, or None.
+    """
+
+    def __init__(self, roster, history, week_count=0, month_count=0, window=None):
+        """Start with an empty ring; use push or from_frames to fill it."""
+        self.roster = roster.reset_index(drop=True)
+        self.history = history
+        self.week_count = week_count
+        self.month_count = month_count
+        self.window = REPEAT_WINDOW if window is None else window
+        self.recent = np.zeros((self.window, len(self.roster)), dtype=np.int32)
+        self.head = 0
+        self.stats = None
+
+    @classmethod
+    def from_frames(cls, main_df, history_df, headers=None):
+        """Build the state from Assignments and Chore History frames.
+
+        headers lists every saved Assignments column when main_df only
+        holds the streamed subset from load_spin_columns.
+        """
+        roster_cols = _roster_columns(main_df.columns)
+        week_count, month_count = get_week_and_month_counts(main_df, headers)
+        state = cls(
+            main_df[roster_cols].copy(),
+            ChoreHistory.from_dataframe(history_df),
+            week_count,
+            month_count,
+        )
+        for col in _recent_week_columns(main_df.columns, state.window):
+            state.push(main_df[col])
+        if headers is None:
+            # Every Week column is here, so the stats can be built as well
+            state.stats = ChoreStats.from_frame(main_df, state.history)
+        return state
+
+    def push(self, chores):
+        """Overwrite the oldest ring week with chores, one per roster row."""
+        if not self.window:
+            return
+        chores = pd.Series(np.asarray(chores, dtype=object))
+        self.history.add_chores(
+            [c for c in dict.fromkeys(chores.dropna()) if c not in self.history.cols]
+        )
+        codes = chores.map(self.history.cols).fillna(-1).to_numpy(dtype=np.int64)
+        self.recent[self.head] = codes + 1
+        self.head = (self.head + 1) % self.window
+
+    def record_week(self, chores, monthly=False):
+        """Advance the counters and ring after a week has been assigned."""
+        self.push(chores)
+        self.week_count += 1
+        self.month_count += int(monthly)
+
+    def record_spin(self, summary):
+        """Advance the state past the weeks in a spin summary.
+
+        Each Month column's chores are counted in the week of the Week
+        column after it, and left out of that Week column's counts, the
+        same way spin_week records them.
+        """
+        monthly = {}
+        for col in summary["columns"]:
+            chores = summary["assignments"][col]
+            week = self.week_count + 1
+            if str(col).startswith("Month"):
+                update_history(self.history, chores, self.stats, week)
+                monthly = chores
+                continue
+            weekly = {p: c for p, c in chores.items() if p not in monthly}
+            update_history(self.history, weekly, self.stats, week)
+            self.record_week(self.roster[EMPLOYEE_COLUMN].map(chores), bool(monthly))
+            monthly = {}
+
+    def recent_assignments(self):
+        """Each person's set of chores from the weeks in the ring."""
+        people = self.roster[EMPLOYEE_COLUMN].tolist()
+        slots, rows = np.nonzero(self.recent)
+        recent = {}
+        for row, code in zip(rows.tolist(), self.recent[slots, rows].tolist()):
+            recent.setdefault(people[row], set()).add(self.history.chores[code - 1])
+        return recent
+
+    @classmethod
+    def load(cls, file_path):
+        """The saved state for a workbook, or None if missing or stale.
+
+        Like the sheet cache, the state is stale once the workbook's size or
+        content hash differs from when it was saved, or if REPEAT_WINDOW
+        has changed since.
+        """
+        try:
+            with open(_state_path(file_path), "rb") as f:
+                saved = _load_pickle(f)
+            size, mtime, digest = saved["checksum"]
+            if saved["window"] != REPEAT_WINDOW:
+                return None
+            if not _fingerprint_matches(file_path, size, mtime, digest):
+                return None
+            history = ChoreHistory(saved["employees"], saved["chores"], saved["counts"])
+            state = cls(
+                saved["roster"], history, saved["weeks"], saved["months"], REPEAT_WINDOW
+            )
+            state.recent = saved["recent"]
+            state.head = saved["head"]
+            if saved.get("stats") is not None:
+                state.stats = ChoreStats(**saved["stats"])
+            return state
+        except (OSError, pickle.UnpicklingError, EOFError, KeyError, ValueError):
+            return None
+
+    def save(self, file_path, fingerprint):
+        """Store the state beside the workbook it was built from.
+
+        fingerprint is the workbook_fingerprint taken when the frames were
+        read, or just after the state's own spin was written. The file is
+        not hashed again here, so a workbook rewritten since then is never
+        stamped as matching this state.
+        """
+        _, size, mtime, digest = fingerprint
+        saved = {
+            "checksum": (size, mtime, digest),
+            "roster": self.roster,
+            "employees": self.history.employees,
+            "chores": self.history.chores,
+            "counts": self.history.counts,
+            "weeks": self.week_count,
+            "months": self.month_count,
+            "window": self.window,
+            "recent": self.recent,
+            "head": self.head,
+            # Plain arrays, so the file loads whatever module name saved it
+            "stats": None if self.stats is None else vars(self.stats),
+        }
+        try:
+            with open(_state_path(file_path), "wb") as f:
+                pickle.dump(saved, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError:
+            pass  # A read-only folder just means rebuilding next time
+
+
+def _recent_mask(people, last_assignments, chores):
+    """people x chores bool matrix, True where the chore was done recently.
+
+    last_assignments maps each person to their last chore or to a set of
+    their recent chores.
+    """
+    cols = {chore: j for j, chore in enumerate(chores)}
+    mask = np.zeros((len(people), len(cols)), dtype=bool)
+    for i, person in enumerate(people):
+        recent = last_assignments.get(person)
+        if not isinstance(recent, (set, frozenset, list, tuple)):
+            recent = (recent,)
+        for chore in recent:
+            if chore in cols:
+                mask[i, cols[chore]] = True
+    return mask
+
+
+def _log_short(chores, assignments, log):
+    """Report each chore that assignments gives fewer people than it needs."""
+    filled = Counter(assignments.values())
+    for chore, needed in chores.items():
+        if filled[chore] < needed:
+            log(f"Only {filled[chore]} of {needed} people could be given {chore}")
+
+
+def assign_chores_fairly(
+    df,
+    chores,
+    excluded_people,
+    last_assignments,
+    history,
+    eligibility=None,
+    log=print,
+):
+    """Fill each chore with the people who have done it least.
+
+    Chores that the fewest people may take are filled first, so people with
+    a required tag are not used up on chores anyone can do; the result
+    still lists the chores in their given order. Chores left short are
+    reported to log.
+    """
+    if isinstance(history, pd.DataFrame):
+        history = ChoreHistory.from_dataframe(history)
+    if eligibility is None:
+        eligibility = Eligibility(df)
+    order = eligibility.candidates(excluded_people).tolist()
+    random.shuffle(order)
+    available = eligibility.names.iloc[order].tolist()
+    names = list(chores)
+    allowed = eligibility.matrix(names)[order]
+    rows = history.row_indices(available)
+    recent = _recent_mask(available, last_assignments, names)
+    used = np.zeros(len(available), dtype=bool)
+    picked = {}
+
+    for j in np.argsort(allowed.sum(axis=0), kind="stable").tolist():
+        chore, needed = names[j], chores[names[j]]
+        eligible = np.flatnonzero(~used & ~recent[:, j] & allowed[:, j])
+        _count("candidates_scanned", len(eligible))
+        counts = history.chore_counts(rows[eligible], chore)
+        selected = list(eligible[np.argsort(counts, kind="stable")][:needed])
+        used[selected] = True
 
         if len(selected) < needed:
-            fallback = [p for p in available if p not in used]
+            # Repeating a recent chore beats leaving it short; lacking a tag does not
+            fallback = list(np.flatnonzero(~used & allowed[:, j]))
             random.shuffle(fallback)
-            for p in fallback:
-                if len(selected) < needed:
-                    selected.append(p)
-                    used.add(p)
+            _count("fallback_picks", min(len(fallback), needed - len(selected)))
+            selected += fallback[: needed - len(selected)]
+            used[selected] = True
+        picked[chore] = selected
+
+    assignments = {available[i]: chore for chore in names for i in picked[chore]}
+    _log_short(chores, assignments, log)
+    return assignments
+
+
+def _solve_assignment(cost):
+    """Min-cost assignment of each row of cost to a distinct column.
+
+    Shortest augmenting path Hungarian algorithm with the inner column scan
+    vectorized; returns the matched (row, column) index arrays.
+    """
+    if cost.shape[0] > cost.shape[1]:
+        cols, rows = _solve_assignment(cost.T)
+        order = np.argsort(rows)
+        return rows[order], cols[order]
+
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    match = np.zeros(m + 1, dtype=np.int64)  # column -> 1-based row, 0 if free
+    way = np.zeros(m + 1, dtype=np.int64)
+    for i in range(1, n + 1):
+        match[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = match[j0]
+            free = ~used
+            reduced = np.full(m + 1, np.inf)
+            reduced[1:] = cost[i0 - 1] - u[i0] - v[1:]
+            better = free & (reduced < minv)
+            minv[better] = reduced[better]
+            way[better] = j0
+            candidates = np.where(free, minv, np.inf)
+            j1 = int(np.argmin(candidates))
+            delta = candidates[j1]
+            u[match[used]] += delta
+            v[used] -= delta
+            minv[free] -= delta
+            j0 = j1
+            if match[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            match[j0] = match[j1]
+            j0 = j1
 
-        for person in selected:
-            assignments[person] = chore
+    cols = np.flatnonzero(match[1:])
+    return match[cols + 1] - 1, cols
 
+
+def assign_chores_optimally(
+    df,
+    chores,
+    excluded_people,
+    last_assignments,
+    history,
+    eligibility=None,
+    log=print,
+):
+    """Assign the whole week as one min-cost bipartite matching.
+
+    Every chore is expanded into one slot per person needed; filling a slot
+    costs the person's history count for that chore plus LAST_CHORE_PENALTY
+    if they did it within the last REPEAT_WINDOW weeks. People lacking a
+    chore's required tags cost so much more that they only fill slots
+    nobody else can, and those matches are then dropped. Chores left short
+    are reported to log.
+    """
+    if isinstance(history, pd.DataFrame):
+        history = ChoreHistory.from_dataframe(history)
+    if eligibility is None:
+        eligibility = Eligibility(df)
+    order = eligibility.candidates(excluded_people).tolist()
+    random.shuffle(order)
+    available = eligibility.names.iloc[order].tolist()
+    names = list(chores)
+    if not available or not names:
+        _log_short(chores, {}, log)
+        return {}
+    allowed = eligibility.matrix(names)[order]
+    rows = history.row_indices(available)
+    recent = _recent_mask(available, last_assignments, names)
+
+    ineligible_cost = LAST_CHORE_PENALTY * (len(available) + 1)
+    chore_costs = np.array(
+        [
+            history.chore_counts(rows, chore)
+            + LAST_CHORE_PENALTY * recent[:, j]
+            + ineligible_cost * ~allowed[:, j]
+            for j, chore in enumerate(names)
+        ],
+        dtype=float,
+    )
+    slots = np.repeat(np.arange(len(names)), [chores[c] for c in names])
+    _count("candidates_scanned", len(slots) * len(available))
+    slot_idx, person_idx = _solve_assignment(chore_costs[slots])
+
+    assignments = {
+        available[p]: names[slots[s]]
+        for s, p in zip(slot_idx, person_idx)
+        if allowed[p, slots[s]]
+    }
+    _log_short(chores, assignments, log)
     return assignments
 
 
+SOLVERS = {
+    "greedy": assign_chores_fairly,
+    "optimal": assign_chores_optimally,
+}
+
+
 def write_assignments(df, assignments, col_name):
     """docstring goes here."""
-    if col_name not in df.columns:
-        df[col_name] = None
-    for person, chore in assignments.items():
-        df.loc[df[EMPLOYEE_COLUMN] == person, col_name] = chore
+    chores = df[EMPLOYEE_COLUMN].map(assignments)
+    if col_name in df.columns:
+        chores = chores.where(chores.notna(), df[col_name].astype(object))
+    df[col_name] = as_chore_categorical(chores)
     return df
 
 
-def update_history(history_df, assignments):
-    """docstring goes here."""
-    for person, chore in assignments.items():
-        if person not in history_df[EMPLOYEE_COLUMN].values:
-            history_df = pd.concat(
-                [history_df, pd.DataFrame([{EMPLOYEE_COLUMN: person}])],
-                ignore_index=True,
-            )
-        if chore not in history_df.columns:
-            history_df[chore] = 0
-        history_df.loc[history_df[EMPLOYEE_COLUMN] == person, chore] += 1
-    return history_df
+def update_history(history, assignments, stats=None, week=None):
+    """Count one turn for each {person: chore} pair in assignments.
+
+    history is a ChoreHistory, or a Chore History frame that is converted
+    to one; new people and chores get zeroed rows and columns first. The
+    changed cells are added to history.changed for patching the saved
+    sheet. With ChoreStats, stats records the turns as done in week.
+    Returns the updated ChoreHistory.
+    """
+    if isinstance(history, pd.DataFrame):
+        history = ChoreHistory.from_dataframe(history)
+    people = list(assignments)
+    chores = list(assignments.values())
+    history.add_employees([p for p in dict.fromkeys(people) if p not in history.rows])
+    history.add_chores([c for c in dict.fromkeys(chores) if c not in history.cols])
+
+    rows = history.row_indices(people)
+    cols = np.array([history.cols[c] for c in chores], dtype=np.int64)
+    np.add.at(history.counts, (rows, cols), 1)
+    history.changed.update(zip(rows.tolist(), cols.tolist()))
+    if stats is not None:
+        # The aggregates move with the counts, week number week
+        stats.fit(history)
+        stats.record(rows, cols, week)
+    return history
+
+
+def column_widths(df):
+    """Fitted width of each column, measured from the DataFrame values."""
+    widths = []
+    for col in df.columns:
+        values = df[col]
+        values = values[values.notna() & values.astype(bool)]
+        longest = values.astype(str).str.len().max() if len(values) else 0
+        widths.append(max(len(str(col)), longest) + 2)
+    return widths
+
+
+def apply_column_widths(ws, widths, start=1):
+    """Set worksheet column widths, starting at column number start."""
+    for i, width in enumerate(widths, start):
+        ws.column_dimensions[openpyxl.utils.get_column_letter(i)].width = width
 
 
 def autofit_column_widths(file_path, sheet_names):
     """docstring goes here."""
-    wb = load_workbook(file_path)
+    wb = openpyxl.load_workbook(file_path)
     for sheet_name in sheet_names:
         ws = wb[sheet_name]
         for col in ws.columns:
             max_length = 0
-            col_letter = get_column_letter(col[0].column)
+            col_letter = openpyxl.utils.get_column_letter(col[0].column)
             for cell in col:
                 if cell.value:
                     max_length = max(max_length, len(str(cell.value)))
@@ -184,49 +1174,823 @@ def autofit_column_widths(file_path, sheet_names):
     wb.save(file_path)
 
 
-def main(file_path=EXCEL_FILE, prompt=True):
-    """docstring goes here."""
-    os.chdir(os.path.dirname(__file__))
-    main_df, history_df = load_excel(file_path)
-    week_count, month_count = get_week_and_month_counts(main_df)
-    next_week_col = f"Week {week_count + 1}"
-    last_assignments = get_last_chore_assignments(main_df)
-    week_number = week_count + 1
-    monthly_chores_this_week = {}
+def monthly_chores_for_week(week_number, monthly=None):
+    """The monthly chores due in a week, from MONTHLY_CHORES by default."""
+    monthly = MONTHLY_CHORES if monthly is None else monthly
     if week_number > 2:
-        monthly_chores_this_week = MONTHLY_CHORES.get((week_number + 1) % 4, {})
+        return monthly.get((week_number + 1) % 4, {})
+    return {}
+
+
+def spin_week(
+    main_df,
+    history,
+    assign=assign_chores_fairly,
+    headers=None,
+    log=print,
+    state=None,
+    day=None,
+):
+    """Assign the next week (and any monthly chore due) in memory.
+
+    headers lists the saved Assignments columns when main_df only holds
+    the streamed subset from load_spin_columns. With a FairnessState, the
+    counters and recent chores come from it instead of main_df's columns,
+    main_df must hold the state's roster rows in order, and the state is
+    advanced past the new week. day is the week's first day, checked
+    against the Away column; today by default.
+    """
+    if state is not None:
+        week_count, month_count = state.week_count, state.month_count
+        last_assignments = state.recent_assignments()
+    else:
+        columns = None
+        if headers is not None:
+            columns = headers + [col for col in main_df.columns if col not in headers]
+        week_count, month_count = get_week_and_month_counts(main_df, columns)
+        last_assignments = get_recent_chore_assignments(main_df)
+    next_week_col = f"Week {week_count + 1}"
+    monthly_chores_this_week = monthly_chores_for_week(week_count + 1)
+    eligibility = Eligibility(main_df, day)
+    stats = state.stats if state is not None else None
 
     monthly_assignments = {}
     excluded = []
     if monthly_chores_this_week:
         next_month_col = f"Month {month_count + 1}"
-        monthly_assignments = assign_chores_fairly(
-            main_df, monthly_chores_this_week, excluded, last_assignments, history_df
+        with _phase("assign"):
+            monthly_assignments = assign(
+                main_df,
+                monthly_chores_this_week,
+                excluded,
+                last_assignments,
+                history,
+                eligibility=eligibility,
+                log=log,
+            )
+            excluded += list(monthly_assignments.keys())
+            main_df = write_assignments(main_df, monthly_assignments, next_month_col)
+        with _phase("history"):
+            history = update_history(
+                history, monthly_assignments, stats, week_count + 1
+            )
+        log(f"Assigned monthly chores: {next_month_col}")
+
+    with _phase("assign"):
+        weekly_assignments = assign(
+            main_df,
+            WEEKLY_CHORES,
+            excluded,
+            last_assignments,
+            history,
+            eligibility=eligibility,
+            log=log,
+        )
+        all_assignments = {**monthly_assignments, **weekly_assignments}
+        main_df = write_assignments(main_df, all_assignments, next_week_col)
+    with _phase("history"):
+        history = update_history(history, weekly_assignments, stats, week_count + 1)
+        if state is not None:
+            state.record_week(main_df[next_week_col], bool(monthly_chores_this_week))
+    log(f"Assigned weekly chores: {next_week_col}")
+    return main_df, history
+
+
+def save_workbook(file_path, main_df, history):
+    """Write both sheets with fitted column widths in a single save."""
+    sheets = {ASSIGNMENT_SHEET: main_df, HISTORY_SHEET: history.to_dataframe()}
+    with _phase("write"):
+        with pd.ExcelWriter(file_path, engine="openpyxl", mode="w") as writer:
+            for sheet_name, df in sheets.items():
+                # Chore codes are only turned back into text for Excel
+                df = decode_assignment_columns(df)
+                df.to_excel(writer, index=False, sheet_name=sheet_name)
+                # Autofit columns before the writer saves
+                with _phase("autofit"):
+                    widths = column_widths(df)
+                    apply_column_widths(writer.sheets[sheet_name], widths)
+        write_sheet_cache(file_path, sheets)
+    _count("bytes_written", os.path.getsize(file_path))
+
+
+def _header_columns(ws):
+    """Map header text to 1-based column numbers for a worksheet."""
+    headers = {}
+    for cell in ws[1]:
+        if cell.value is not None:
+            headers.setdefault(cell.value, cell.column)
+    return headers
+
+
+def _employee_rows(ws, employee_col):
+    """Map employee names to the 1-based sheet rows they appear on."""
+    rows = {}
+    for (cell,) in ws.iter_rows(min_row=2, min_col=employee_col, max_col=employee_col):
+        if cell.value is not None:
+            rows.setdefault(cell.value, []).append(cell.row)
+    return rows
+
+
+def update_workbook(file_path, main_df, history, written=None):
+    """Patch the saved workbook with only what a spin changed.
+
+    See _patch_workbook; returns False when a full rewrite is needed.
+    """
+    with _phase("write"):
+        patched = _patch_workbook(file_path, main_df, history, written)
+    if patched:
+        _count("bytes_written", os.path.getsize(file_path))
+    return patched
+
+
+def _patch_workbook(file_path, main_df, history, written=None):
+    """Write a spin's changes into the saved workbook in place.
+
+    New Assignments columns are appended and changed Chore History cells
+    are overwritten; everything else in the workbook, including formatting
+    and extra sheets, is left as it was. Returns False without saving when
+    the workbook does not match the frames and needs a full rewrite.
+    written, if given, is filled with the {(person, chore): count} Chore
+    History cells that were saved.
+    """
+    written = {} if written is None else written
+    cached = read_cached_sheets(file_path)
+    wb = openpyxl.load_workbook(file_path)
+    if ASSIGNMENT_SHEET not in wb.sheetnames or HISTORY_SHEET not in wb.sheetnames:
+        return False
+
+    ws = wb[ASSIGNMENT_SHEET]
+    headers = _header_columns(ws)
+    if EMPLOYEE_COLUMN not in headers:
+        return False
+    sheet_rows = _employee_rows(ws, headers[EMPLOYEE_COLUMN])
+    if not set(main_df[EMPLOYEE_COLUMN].dropna()) <= set(sheet_rows):
+        return False
+    new_cols = [col for col in main_df.columns if col not in headers]
+    # Chore codes are only turned back into text for Excel
+    new_df = decode_assignment_columns(main_df[[EMPLOYEE_COLUMN] + new_cols])
+    start = max(headers.values()) + 1
+    for col_num, col in enumerate(new_cols, start):
+        ws.cell(row=1, column=col_num, value=col)
+        for person, chore in zip(new_df[EMPLOYEE_COLUMN], new_df[col]):
+            if pd.notna(person) and pd.notna(chore):
+                for row in sheet_rows[person]:
+                    ws.cell(row=row, column=col_num, value=chore)
+                    _count("cells_written")
+    apply_column_widths(ws, column_widths(new_df[new_cols]), start)
+
+    ws = wb[HISTORY_SHEET]
+    headers = _header_columns(ws)
+    if EMPLOYEE_COLUMN not in headers:
+        return False
+    sheet_rows = _employee_rows(ws, headers[EMPLOYEE_COLUMN])
+    new_chores = [chore for chore in history.chores if chore not in headers]
+    new_people = [p for p in history.employees if p not in sheet_rows]
+    next_col = max(headers.values()) + 1
+    for col_num, chore in enumerate(new_chores, next_col):
+        ws.cell(row=1, column=col_num, value=chore)
+        headers[chore] = col_num
+    next_row = ws.max_row + 1
+    for row_num, person in enumerate(new_people, next_row):
+        ws.cell(row=row_num, column=headers[EMPLOYEE_COLUMN], value=person)
+        sheet_rows[person] = [row_num]
+
+    # New rows and columns are written in full, other cells only if changed
+    cells = set(history.changed)
+    for chore in new_chores:
+        cells.update((r, history.cols[chore]) for r in range(len(history.employees)))
+    for person in new_people:
+        cells.update((history.rows[person], c) for c in range(len(history.chores)))
+    _count("cells_written", len(cells))
+    for r, c in cells:
+        value = int(history.counts[r, c])
+        person, chore = history.employees[r], history.chores[c]
+        written[person, chore] = value
+        for row in sheet_rows[person]:
+            ws.cell(row=row, column=headers[chore], value=value)
+    if new_chores:
+        history_df = history.to_dataframe()
+        apply_column_widths(ws, column_widths(history_df[new_chores]), next_col)
+
+    wb.save(file_path)
+    history.changed.clear()
+
+    # Bring a cache that matched the old workbook up to date with the patch
+    if cached is not None and ASSIGNMENT_SHEET in cached and HISTORY_SHEET in cached:
+        cached[ASSIGNMENT_SHEET] = merge_assignment_columns(
+            cached[ASSIGNMENT_SHEET], main_df
+        )
+        cached[HISTORY_SHEET] = _patch_history_frame(
+            cached[HISTORY_SHEET], new_people, written
+        )
+        write_sheet_cache(file_path, cached)
+    return True
+
+
+def _patch_history_frame(history_df, new_people, written):
+    """Apply the cells _patch_workbook saved to a Chore History frame.
+
+    Only the saved cells change, so the frame still matches the sheet when
+    the in-memory history held other, unsaved counts.
+    """
+    if new_people:
+        new_rows = pd.DataFrame({EMPLOYEE_COLUMN: new_people})
+        history_df = pd.concat([history_df, new_rows], ignore_index=True)
+    else:
+        history_df = history_df.copy()
+    positions = history_df.groupby(EMPLOYEE_COLUMN, sort=False).indices
+    by_chore = {}
+    for (person, chore), value in written.items():
+        rows, values = by_chore.setdefault(chore, ([], []))
+        rows.extend(positions[person])
+        values.extend([value] * len(positions[person]))
+    for chore, (rows, values) in by_chore.items():
+        if chore in history_df.columns:
+            column = history_df[chore].to_numpy(dtype=float, copy=True)
+        else:
+            column = np.full(len(history_df), np.nan)
+        column[rows] = values
+        # Blank cells read back as NaN, a full column as integers
+        if not np.isnan(column).any():
+            column = column.astype(np.int64)
+        history_df[chore] = column
+    return history_df
+
+
+class SpinCancelled(Exception):
+    """Raised when a spin is cancelled before anything was saved."""
+
+
+def _check_cancel(cancel):
+    """Stop a spin between steps if its cancel event has been set."""
+    if cancel is not None and cancel.is_set():
+        raise SpinCancelled("Spin cancelled; the workbook was not changed.")
+
+
+def load_fairness_state(file_path, log=print):
+    """A workbook's FairnessState, from its sidecar or rebuilt from the sheets."""
+    with _phase("load"):
+        state = FairnessState.load(file_path)
+    if state is not None:
+        _count("state_hits")
+        return state
+    streamed = load_spin_columns(file_path)
+    if streamed is None:
+        main_df, history_df = load_excel(file_path, log)
+        headers = None
+    else:
+        main_df, history_df, headers = streamed
+    return FairnessState.from_frames(main_df, history_df, headers)
+
+
+def _week_days(day, n):
+    """The first days of n consecutive weeks from day, today by default."""
+    day = date.today() if day is None else day
+    return [day + timedelta(weeks=week) for week in range(n)]
+
+
+def plan_weeks(file_path, n, solver="greedy", log=print, cancel=None, day=None):
+    """Assign n consecutive weeks in memory and save the workbook once.
+
+    The first week starts on day (today by default) for the Away column.
+    Progress messages go to log. If the threading.Event cancel is set before
+    saving starts, SpinCancelled is raised and the workbook is untouched.
+    """
+    assign = SOLVERS[solver]
+    log(f"Loading {file_path}")
+    state = load_fairness_state(file_path, log)
+    main_df = state.roster.copy()
+    for week_day in _week_days(day, n):
+        _check_cancel(cancel)
+        main_df, _ = spin_week(
+            main_df, state.history, assign, log=log, state=state, day=week_day
         )
-        excluded += list(monthly_assignments.keys())
-        main_df = write_assignments(main_df, monthly_assignments, next_month_col)
-        history_df = update_history(history_df, monthly_assignments)
-        print(f"Assigned monthly chores: {next_month_col}")
+    _check_cancel(cancel)
+    log(f"Saving {file_path}")
+    if not update_workbook(file_path, main_df, state.history):
+        # Only the roster and new columns are in memory; load the rest to rewrite
+        main_df = merge_assignment_columns(load_excel(file_path, log)[0], main_df)
+        save_workbook(file_path, main_df, state.history)
+    state.save(file_path, workbook_fingerprint(file_path))
+    log(f"All chores and history saved to {file_path}.")
+    return main_df, state.history
+
+
+def spin(
+    assignments_df,
+    history_df,
+    solver="greedy",
+    weeks=1,
+    log=print,
+    cancel=None,
+    day=None,
+):
+    """Assign weeks on in-memory sheets without reading or writing any file.
+
+    The first week starts on day, today by default. Returns updated copies
+    of the Assignments and Chore History frames and a change summary: the
+    new Week/Month columns, the {person: chore} assignments in each, and the
+    (person, chore) history cells that changed.
+    """
+    assign = SOLVERS[solver]
+    main_df = assignments_df.copy()
+    history = ChoreHistory.from_dataframe(history_df)
+    old_cols = set(main_df.columns)
+    for week_day in _week_days(day, weeks):
+        _check_cancel(cancel)
+        main_df, history = spin_week(main_df, history, assign, log=log, day=week_day)
+
+    new_cols = [col for col in main_df.columns if col not in old_cols]
+    summary = {
+        "columns": new_cols,
+        "assignments": {
+            col: dict(main_df[[EMPLOYEE_COLUMN, col]].dropna().values)
+            for col in new_cols
+        },
+        "history_changes": sorted(
+            (history.employees[r], history.chores[c]) for r, c in history.changed
+        ),
+    }
+    return main_df, history.to_dataframe(), summary
+
+
+def save_spin(file_path, assignments_df, history_df, summary):
+    """Patch the result of spin into the saved workbook.
+
+    Only the summary's new columns and changed history cells are written.
+    Returns False, leaving the file alone, if the workbook does not match
+    and the caller needs to save it in full instead.
+    """
+    history = ChoreHistory.from_dataframe(history_df)
+    history.changed = {
+        (history.rows[person], history.cols[chore])
+        for person, chore in summary["history_changes"]
+    }
+    main_df = assignments_df[[EMPLOYEE_COLUMN] + summary["columns"]]
+    # Taken before the patch changes the checksum it is checked against
+    state = FairnessState.load(file_path)
+    written = {}
+    if not update_workbook(file_path, main_df, history, written):
+        return False
+    # The frames may hold unsaved edits, so the state is only kept when it
+    # agrees with what was written; otherwise the next spin rebuilds it
+    if state is not None:
+        state.record_spin(summary)
+        if _state_matches(state, summary, written):
+            state.save(file_path, workbook_fingerprint(file_path))
+    return True
+
+
+def _state_matches(state, summary, written):
+    """Whether a state advanced past a spin agrees with the cells saved.
+
+    The spin's Week and Month columns must be the ones after the state's
+    counters, and every saved Chore History count must equal the state's.
+    """
+    weeks = [col for col in summary["columns"] if not str(col).startswith("Month")]
+    months = [col for col in summary["columns"] if str(col).startswith("Month")]
+    first_week = state.week_count - len(weeks) + 1
+    first_month = state.month_count - len(months) + 1
+    if weeks != [f"Week {n}" for n in range(first_week, state.week_count + 1)]:
+        return False
+    if months != [f"Month {n}" for n in range(first_month, state.month_count + 1)]:
+        return False
+    history = state.history
+    for (person, chore), count in written.items():
+        if person not in history.rows or chore not in history.cols:
+            return False
+        if history.counts[history.rows[person], history.cols[chore]] != count:
+            return False
+    return True
+
+
+def find_workbooks(pattern):
+    """Workbooks in a directory, or matching a glob, as absolute paths."""
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "*.xlsx")
+    return sorted(
+        os.path.abspath(path)
+        for path in glob.glob(pattern)
+        if os.path.isfile(path) and not os.path.basename(path).startswith("~$")
+    )
+
+
+def _run_one(file_path, weeks, solver, day=None, measure=False):
+    """Spin one workbook in a worker process and report how it went.
+
+    With measure, a successful result also carries the run's SpinMetrics
+    record under "metrics".
+    """
+    random.seed()  # Forked workers would otherwise share one random state
+    start = time.perf_counter()
+    result = {"file": file_path, "log": []}
+    metrics = SpinMetrics() if measure else None
+    try:
+        with instrument(metrics), _phase("total"):
+            plan_weeks(file_path, weeks, solver, log=result["log"].append, day=day)
+        result.update(ok=True, output=file_path)
+        if metrics is not None:
+            result["metrics"] = metrics.record(
+                file=file_path, solver=solver, weeks=weeks
+            )
+    except Exception as e:
+        result.update(ok=False, error=f"{type(e).__name__}: {e}")
+    result["seconds"] = time.perf_counter() - start
+    return result
+
 
-    weekly_assignments = assign_chores_fairly(
-        main_df, WEEKLY_CHORES, excluded, last_assignments, history_df
+def run_batch(
+    pattern,
+    workers=None,
+    weeks=1,
+    solver="greedy",
+    log=print,
+    metrics_log=None,
+    day=None,
+):
+    """Spin every workbook matched by pattern in a pool of processes.
+
+    A workbook that fails (corrupt, locked by Excel, ...) is reported and
+    does not stop the others. Returns one result dict per workbook. As in
+    main, each successful spin's metrics are appended to metrics_log (or
+    METRICS_LOG), and day is the first day of the first week.
+    """
+    metrics_log = metrics_log or METRICS_LOG
+    paths = find_workbooks(pattern)
+    if not paths:
+        log(f"No workbooks found for {pattern}")
+        return []
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    results = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_run_one, path, weeks, solver, day, bool(metrics_log)): path
+            for path in paths
+        }
+        for future in as_completed(futures):
+            try:
+                results.append(future.result())
+            except Exception as e:  # The worker process itself died
+                results.append(
+                    {
+                        "file": futures[future],
+                        "ok": False,
+                        "error": repr(e),
+                        "seconds": 0,
+                    }
+                )
+
+    results.sort(key=lambda result: result["file"])
+    log(f"Batch of {len(paths)} workbooks in {time.perf_counter() - start:.2f}s:")
+    for result in results:
+        if result["ok"]:
+            status = f"OK    {result['file']} ({result['seconds']:.2f}s)"
+            log(f"  {status} -> {result['output']}")
+        else:
+            status = f"FAIL  {result['file']} ({result['seconds']:.2f}s)"
+            log(f"  {status}: {result['error']}")
+    failed = sum(not result["ok"] for result in results)
+    log(f"{len(results) - failed} succeeded, {failed} failed.")
+    if metrics_log:
+        # Written here rather than by the workers, so lines never interleave
+        with open(metrics_log, "a", encoding="utf-8") as f:
+            for result in results:
+                if "metrics" in result:
+                    f.write(json.dumps(result["metrics"]) + "\n")
+    return results
+
+
+def workbook_stats(file_path, log=print):
+    """Per-person chore statistics for a workbook.
+
+    Comes from the aggregates saved in the fairness state, so it costs
+    people x chores rather than a scan of every Week column. Only a state
+    saved without them is rebuilt from the whole Assignments sheet, once.
+    counts and last_done are people x chores arrays in chores order;
+    last_done holds week numbers, 0 for never.
+    """
+    state = load_fairness_state(file_path, log)
+    if state.stats is None:
+        # Taken first, so a workbook saved while this reads is not stamped
+        fingerprint = workbook_fingerprint(file_path)
+        state = FairnessState.from_frames(*load_excel(file_path, log))
+        state.save(file_path, fingerprint)
+    history, stats = state.history, state.stats
+    stats.fit(history)
+
+    people = [p for p in state.roster[EMPLOYEE_COLUMN] if pd.notna(p)]
+    rows = history.row_indices(people)
+    known = rows >= 0
+    rows = np.where(known, rows, 0)  # Masked back to zero below
+    counts = np.where(known[:, None], history.counts[rows], 0)
+    totals = counts.sum(axis=1)
+    return {
+        "weeks": state.week_count,
+        "months": state.month_count,
+        "people": people,
+        "chores": list(history.chores),
+        "counts": counts,
+        "last_done": np.where(known[:, None], stats.last_week[rows], 0),
+        "streaks": np.where(known, stats.current_streaks(rows, state.week_count), 0),
+        "longest_streaks": np.where(known, stats.longest[rows], 0),
+        "totals": dict(zip(people, totals.tolist())),
+        "spread": int(np.ptp(totals)) if len(totals) else 0,
+    }
+
+
+def print_stats(file_path, chore=None):
+    """Print workbook_stats as a short report, or the standings for one chore."""
+    stats = workbook_stats(file_path, log=lambda _: None)
+    totals = stats["totals"]
+    print(f"Weeks assigned: {stats['weeks']} ({stats['months']} with monthly chores)")
+    print(f"Employees: {len(totals)}")
+    if not totals:
+        return 0
+    width = max(len(str(person)) for person in totals)
+
+    if chore is not None:
+        if chore not in stats["chores"]:
+            print(f"No one has done '{chore}' yet.")
+            return 1
+        j = stats["chores"].index(chore)
+        counts = stats["counts"][:, j].tolist()
+        last = stats["last_done"][:, j].tolist()
+        print(f"{chore}, fewest turns first:")
+        # Fewest turns first, then the longest since their last turn
+        for i in sorted(range(len(counts)), key=lambda i: (counts[i], last[i])):
+            when = f"last Week {last[i]}" if last[i] else "never"
+            print(f"  {str(stats['people'][i]):<{width}}  {counts[i]:>3}  {when}")
+        return 0
+
+    low, high = min(totals.values()), max(totals.values())
+    mean = sum(totals.values()) / len(totals)
+    print(
+        f"Chores per person: {low} to {high} (spread {stats['spread']}),"
+        f" mean {mean:.1f}"
     )
-    all_assignments = {**monthly_assignments, **weekly_assignments}
-    main_df = write_assignments(main_df, all_assignments, next_week_col)
-    history_df = update_history(history_df, weekly_assignments)
-    print(f"Assigned weekly chores: {next_week_col}")
+    print(f"  {'Employee':<{width}}  Total  Streak  Longest")
+    order = sorted(range(len(totals)), key=lambda i: -stats["counts"][i].sum())
+    for i in order:
+        print(
+            f"  {str(stats['people'][i]):<{width}}"
+            f"  {int(stats['counts'][i].sum()):>5}"
+            f"  {int(stats['streaks'][i]):>6}"
+            f"  {int(stats['longest_streaks'][i]):>7}"
+        )
+    return 0
+
 
-    with pd.ExcelWriter(file_path, engine="openpyxl", mode="w") as writer:
-        main_df.to_excel(writer, index=False, sheet_name=ASSIGNMENT_SHEET)
-        history_df.to_excel(writer, index=False, sheet_name=HISTORY_SHEET)
+def validate_workbook(file_path):
+    """Problems that would stop a spin or make it unfair, as (level, message).
 
-    # Autofit columns in both sheets
-    autofit_column_widths(file_path, [ASSIGNMENT_SHEET, HISTORY_SHEET])
+    level is "error" for problems a spin cannot work around and "warning"
+    for ones it silently works around.
+    """
+    if not os.path.exists(file_path):
+        return [("error", f"{file_path} does not exist.")]
+    try:
+        sheets = read_workbook(file_path)
+    except Exception as e:
+        return [("error", f"Cannot read {file_path}: {e}")]
 
-    print(f"All chores and history saved to {file_path}.")
+    problems = []
+    try:
+        main_df, history_df = select_sheets(
+            sheets, log=lambda message: problems.append(("warning", message))
+        )
+    except ValueError as e:
+        return problems + [("error", str(e))]
+    if HISTORY_SHEET not in sheets:
+        problems.append(
+            ("warning", f"No '{HISTORY_SHEET}' sheet; chores are shared from scratch.")
+        )
+
+    names = main_df[EMPLOYEE_COLUMN]
+    blank = int(names.isna().sum())
+    if blank:
+        problems.append(("warning", f"{blank} row(s) with no {EMPLOYEE_COLUMN} name."))
+    duplicated = names[names.duplicated() & names.notna()].unique().tolist()
+    if duplicated:
+        problems.append(("warning", f"Listed more than once: {duplicated}"))
+    if OUT_COLUMN in main_df.columns:
+        values = main_df[OUT_COLUMN].dropna()
+        # TRUE/FALSE, 1/0 (how pandas reads TRUE next to blanks) or the text
+        valid = [_out_value(v) or _out_value_false(v) for v in values]
+        other = values[~np.array(valid, dtype=bool)].unique().tolist()
+        if other:
+            problems.append(
+                ("warning", f"'{OUT_COLUMN}' values other than True/False: {other}")
+            )
+
+    try:
+        eligibility = Eligibility(main_df)
+    except ValueError as e:
+        problems.append(("error", str(e)))
+    else:
+        needed = dict(WEEKLY_CHORES)
+        for due in MONTHLY_CHORES.values():
+            needed.update(due)
+        for chore in CHORE_REQUIREMENTS:
+            if chore not in needed:
+                problems.append(
+                    ("warning", f"CHORE_REQUIREMENTS names an unknown chore: {chore}")
+                )
+                continue
+            able = int(eligibility.mask(chore).sum())
+            if able < needed[chore]:
+                problems.append(
+                    (
+                        "warning",
+                        f"Only {able} available people have the tags for"
+                        f" '{chore}', which needs {needed[chore]}.",
+                    )
+                )
+
+    chore_cols = [col for col in main_df.columns if _is_chore_column(col)]
+    known = set(chore_dtype().categories)
+    unknown = set()
+    for col in chore_cols:
+        unknown.update(set(main_df[col].dropna().astype(object)) - known)
+    if unknown:
+        problems.append(("warning", f"Chores no longer configured: {sorted(unknown)}"))
+    weeks = [col for col in chore_cols if str(col).startswith("Week")]
+    if weeks != [f"Week {i}" for i in range(1, len(weeks) + 1)]:
+        problems.append(
+            (
+                "warning",
+                f"Week columns are not numbered 1 to {len(weeks)};"
+                f" the next spin is Week {len(weeks) + 1}.",
+            )
+        )
+
+    chores = [col for col in history_df.columns if col != EMPLOYEE_COLUMN]
+    raw = history_df[chores]
+    counts = raw.apply(pd.to_numeric, errors="coerce")
+    if (counts.isna() & raw.notna()).any().any():
+        problems.append(
+            ("error", f"'{HISTORY_SHEET}' has counts that are not numbers.")
+        )
+    if (counts < 0).any().any():
+        problems.append(("error", f"'{HISTORY_SHEET}' has negative counts."))
+    return problems
+
+
+def print_validation(file_path):
+    """Print validate_workbook's findings; 1 if there were errors, else 0."""
+    problems = validate_workbook(file_path)
+    for level, message in problems:
+        print(f"{level.upper()}: {message}")
+    if not problems:
+        print(f"OK: {file_path}")
+    return int(any(level == "error" for level, _ in problems))
+
+
+def main(
+    file_path=EXCEL_FILE,
+    prompt=True,
+    solver="greedy",
+    weeks=1,
+    metrics_log=None,
+    day=None,
+):
+    """docstring goes here."""
+    os.chdir(os.path.dirname(__file__))
+    metrics_log = metrics_log or METRICS_LOG
+    if metrics_log:
+        metrics = SpinMetrics()
+        with instrument(metrics), metrics.phase("total"):
+            plan_weeks(file_path, weeks, solver, day=day)
+        print("\n".join(metrics.summary()))
+        metrics.write(metrics_log, file=file_path, solver=solver, weeks=weeks)
+    else:
+        plan_weeks(file_path, weeks, solver, day=day)
     if prompt:
         input("Done. Press ENTER to exit.")
 
 
+COMMANDS = ("assign", "plan", "stats", "validate")
+
+
+def parse_args(argv=None):
+    """Parse a command line; without a command it plans like the old script."""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    positional = [arg for arg in argv if not arg.startswith("-")]
+    legacy = not (positional and positional[0] in COMMANDS) and argv[:1] not in (
+        ["-h"],
+        ["--help"],
+    )
+    if legacy:
+        argv = ["plan", *argv]
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("file", nargs="?", default=EXCEL_FILE)
+    common.add_argument(
+        "--importtime",
+        action="store_true",
+        help="report how long chore_wheel and its libraries took to import",
+    )
+    spinning = argparse.ArgumentParser(add_help=False)
+    spinning.add_argument(
+        "--solver",
+        choices=sorted(SOLVERS),
+        default="greedy",
+        help="greedy fills chores in order, optimal solves the week at once",
+    )
+    spinning.add_argument(
+        "--batch",
+        metavar="DIR_OR_GLOB",
+        help="spin every workbook in a directory or matching a glob",
+    )
+    spinning.add_argument(
+        "--workers",
+        type=int,
+        help="worker processes for --batch (default: one per CPU)",
+    )
+    spinning.add_argument(
+        "--metrics-log",
+        help="append a JSON record of phase timings and counters to this file",
+    )
+    spinning.add_argument(
+        "--date",
+        type=date.fromisoformat,
+        help="first day (YYYY-MM-DD) of the week to assign, for the Away column;"
+        " today by default",
+    )
+    spinning.add_argument(
+        "--no-prompt",
+        action="store_true",
+        help="exit without waiting for ENTER",
+    )
+
+    parser = argparse.ArgumentParser(description="Spin the chore wheel.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    command = commands.add_parser(
+        "assign", parents=[common, spinning], help="assign the next week"
+    )
+    command.set_defaults(weeks=1)
+    command = commands.add_parser(
+        "plan", parents=[common, spinning], help="assign several weeks at once"
+    )
+    command.add_argument(
+        "--weeks",
+        type=int,
+        default=1,
+        help="number of consecutive weeks to plan before saving",
+    )
+    command = commands.add_parser(
+        "stats", parents=[common], help="show how chores have been shared out"
+    )
+    command.add_argument(
+        "--chore", help="list everyone's turns at one chore, fewest first"
+    )
+    commands.add_parser(
+        "validate", parents=[common], help="check a workbook for problems"
+    )
+    args = parser.parse_args(argv)
+    # Only the original double-click style run waits for ENTER
+    args.prompt = legacy and not args.no_prompt if "no_prompt" in args else False
+    return args
+
+
+def run(argv=None):
+    """Run a command line and return its exit status."""
+    args = parse_args(argv)
+    try:
+        if args.command in ("stats", "validate"):
+            # Relative to the script, as main treats them
+            folder = os.path.dirname(os.path.abspath(__file__))
+            file_path = os.path.join(folder, args.file)
+            if args.command == "stats":
+                return print_stats(file_path, args.chore)
+            return print_validation(file_path)
+        if args.batch:
+            results = run_batch(
+                args.batch,
+                args.workers,
+                args.weeks,
+                args.solver,
+                metrics_log=args.metrics_log,
+                day=args.date,
+            )
+            return 0 if results and all(r["ok"] for r in results) else 1
+        main(
+            args.file,
+            args.prompt,
+            args.solver,
+            args.weeks,
+            args.metrics_log,
+            args.date,
+        )
+        return 0
+    finally:
+        if args.importtime:
+            print("\n".join(import_report()), file=sys.stderr)
+
+
+IMPORT_TIMES["chore_wheel"] = time.perf_counter() - _import_start
+
 if __name__ == "__main__":
-    main(EXCEL_FILE, True)
+    sys.exit(run())
@@ -0,0 +1,78 @@
+"""Tests for moving a chore workbook through the SQLite database."""
+
+import os
+import random
+import sys
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("openpyxl")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import chore_db  # noqa: E402
+import chore_wheel  # noqa: E402
+
+
+def quiet(_):
+    pass
+
+
+def test_import_then_export_keeps_the_workbook(tmp_path):
+    random.seed(2)
+    source = str(tmp_path / "source.xlsx")
+    names = [f"Person {i}" for i in range(20)]
+    main_df = pd.DataFrame(
+        {
+            "Employee": names,
+            "Out": [True] + [None] * 19,
+            "Tags": ["Lab"] + [None] * 19,
+            "Away": [None] * 19 + ["2030-01-01 to 2030-01-14"],
+        }
+    )
+    history = chore_wheel.ChoreHistory(names, ["Fridges"], [[2]] + [[0]] * 19)
+    for _ in range(5):
+        main_df, history = chore_wheel.spin_week(main_df, history, log=quiet)
+    chore_wheel.save_workbook(source, main_df, history)
+
+    db = str(tmp_path / "chores.db")
+    chore_db.import_workbook(source, db, log=quiet)
+    exported = str(tmp_path / "exported.xlsx")
+    chore_db.export_workbook(db, exported, log=quiet)
+
+    before = pd.read_excel(source, sheet_name=None)
+    after = pd.read_excel(exported, sheet_name=None)
+    pd.testing.assert_frame_equal(
+        after[chore_wheel.ASSIGNMENT_SHEET],
+        before[chore_wheel.ASSIGNMENT_SHEET],
+        check_dtype=False,
+    )
+    history_before = before[chore_wheel.HISTORY_SHEET].set_index("Employee")
+    history_after = after[chore_wheel.HISTORY_SHEET].set_index("Employee")
+    pd.testing.assert_frame_equal(
+        history_after.loc[history_before.index, history_before.columns],
+        history_before,
+        check_dtype=False,
+    )
+
+
+def test_spin_adds_one_week_for_people_who_are_in(tmp_path):
+    random.seed(3)
+    source = str(tmp_path / "source.xlsx")
+    names = [f"Person {i}" for i in range(40)]
+    main_df = pd.DataFrame({"Employee": names, "Out": [True] + [None] * 39})
+    chore_wheel.save_workbook(source, main_df, chore_wheel.ChoreHistory(names, []))
+    db = str(tmp_path / "chores.db")
+    chore_db.import_workbook(source, db, log=quiet)
+
+    spun = chore_db.spin(db, weeks=2, log=quiet)
+
+    conn = chore_db.connect(db)
+    try:
+        assert chore_db.read_counters(conn) == (2, 0)
+    finally:
+        conn.close()
+    assert "Person 0" not in set(spun["Employee"])
+    assert spun["Week 2"].notna().sum() == sum(chore_wheel.WEEKLY_CHORES.values())
@@ -0,0 +1,71 @@
+"""Regression tests for saving only the edited cells of a sheet."""
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+openpyxl = pytest.importorskip("openpyxl")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("tkinter")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def load_editor():
+    """Import the editor script, whose file name is not a module name."""
+    path = os.path.join(ROOT, "HCRU Chore Assignment Wheel.py")
+    spec = importlib.util.spec_from_file_location("chore_editor", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+editor = load_editor()
+
+
+def make_sheet(rows):
+    """A worksheet holding an Employee/Week 1 header and rows."""
+    ws = openpyxl.Workbook().active
+    ws.append(["Employee", "Week 1"])
+    for row in rows:
+        ws.append(row)
+    return ws
+
+
+def sheet_rows(ws):
+    return [[cell.value for cell in row] for row in ws.iter_rows(min_row=2)]
+
+
+def test_cleared_cell_is_written_blank():
+    ws = make_sheet([["A", "typo"], ["B", "Fridges"]])
+    df = pd.DataFrame({"Employee": ["A", "B"], "Week 1": [None, "Fridges"]})
+    changes = editor.SheetChanges(2)
+    changes.edit(0, "Week 1")
+
+    assert editor.patch_sheet(ws, df, changes)
+    assert sheet_rows(ws) == [["A", None], ["B", "Fridges"]]
+
+
+def test_inserted_and_deleted_rows():
+    ws = make_sheet([["A", 1], ["B", 2], ["C", 3]])
+    changes = editor.SheetChanges(3)
+    changes.delete_rows([1])
+    changes.insert_rows([0])
+    changes.edit(2, "Week 1")
+    df = pd.DataFrame({"Employee": ["N", "A", "C"], "Week 1": [None, 1, None]})
+
+    assert editor.patch_sheet(ws, df, changes)
+    assert sheet_rows(ws) == [["N", None], ["A", 1], ["C", None]]
+
+
+def test_sheet_changed_on_disk_is_left_alone():
+    ws = make_sheet([["A", 1], ["B", 2]])
+    changes = editor.SheetChanges(3)
+    changes.edit(0, "Week 1")
+    df = pd.DataFrame({"Employee": ["A", "B", "C"], "Week 1": [5, 2, 3]})
+
+    assert not editor.patch_sheet(ws, df, changes)
+    assert sheet_rows(ws) == [["A", 1], ["B", 2]]
@@ -0,0 +1,61 @@
+"""Tests for the min-cost assignment behind the optimal solver."""
+
+import itertools
+import os
+import random
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import chore_wheel  # noqa: E402
+
+
+def brute_force_cost(cost):
+    """The cheapest total over every way to match the shorter side."""
+    rows, cols = cost.shape
+    if rows > cols:
+        return brute_force_cost(cost.T)
+    return min(
+        sum(cost[r, c] for r, c in zip(range(rows), perm))
+        for perm in itertools.permutations(range(cols), rows)
+    )
+
+
+@pytest.mark.parametrize("shape", [(4, 4), (3, 6), (6, 3)])
+def test_solve_assignment_is_optimal(shape):
+    rng = np.random.default_rng(7)
+    for _ in range(20):
+        cost = rng.integers(0, 20, size=shape).astype(float)
+        rows, cols = chore_wheel._solve_assignment(cost)
+
+        assert len(rows) == min(shape)
+        assert len(set(rows.tolist())) == len(rows)
+        assert len(set(cols.tolist())) == len(cols)
+        assert cost[rows, cols].sum() == brute_force_cost(cost)
+
+
+def test_optimal_solver_spreads_turns_and_respects_tags(monkeypatch):
+    random.seed(0)
+    monkeypatch.setattr(chore_wheel, "CHORE_REQUIREMENTS", {"Shower": ["lab"]})
+    df = pd.DataFrame(
+        {
+            "Employee": ["A", "B", "C", "D"],
+            "Tags": [None, "Lab", None, "lab"],
+        }
+    )
+    history = chore_wheel.ChoreHistory(
+        ["A", "B", "C", "D"], ["Shower", "Fridges"], [[0, 5], [3, 0], [0, 0], [0, 4]]
+    )
+
+    assignments = chore_wheel.assign_chores_optimally(
+        df, {"Shower": 1, "Fridges": 2}, [], {}, history, log=lambda _: None
+    )
+
+    # Only B and D may shower; D has showered less, so B takes Fridges
+    assert assignments == {"D": "Shower", "B": "Fridges", "C": "Fridges"}
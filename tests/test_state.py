@@ -0,0 +1,106 @@
+"""Tests for the fairness state and sheet cache kept beside a workbook."""
+
+import os
+import random
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("openpyxl")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import chore_wheel  # noqa: E402
+
+
+def quiet(_):
+    pass
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    """A saved workbook for twenty people with no weeks assigned yet."""
+    random.seed(1)
+    path = str(tmp_path / "ChoreAssignments.xlsx")
+    names = [f"Person {i}" for i in range(20)]
+    main_df = pd.DataFrame({"Employee": names})
+    history = chore_wheel.ChoreHistory(names, [])
+    chore_wheel.save_workbook(path, main_df, history)
+    return path
+
+
+def test_state_round_trip_matches_rebuild(workbook):
+    chore_wheel.plan_weeks(workbook, 6, log=quiet)
+
+    state = chore_wheel.FairnessState.load(workbook)
+    rebuilt = chore_wheel.FairnessState.from_frames(
+        *chore_wheel.load_excel(workbook, quiet)
+    )
+
+    assert state is not None
+    assert (state.week_count, state.month_count) == (6, 2)
+    assert (rebuilt.week_count, rebuilt.month_count) == (6, 2)
+    counts = state.history.to_dataframe().set_index("Employee")
+    expected = rebuilt.history.to_dataframe().set_index("Employee")
+    pd.testing.assert_frame_equal(counts[expected.columns], expected, check_dtype=False)
+    assert state.recent_assignments() == rebuilt.recent_assignments()
+
+
+def test_state_is_stale_after_workbook_changes(workbook, monkeypatch):
+    chore_wheel.plan_weeks(workbook, 2, log=quiet)
+    assert chore_wheel.FairnessState.load(workbook) is not None
+
+    monkeypatch.setattr(chore_wheel, "REPEAT_WINDOW", chore_wheel.REPEAT_WINDOW + 1)
+    assert chore_wheel.FairnessState.load(workbook) is None
+    monkeypatch.undo()
+
+    main_df, history_df = chore_wheel.load_excel(workbook, quiet)
+    main_df = main_df.copy()
+    main_df.loc[0, "Employee"] = "Renamed"
+    history = chore_wheel.ChoreHistory.from_dataframe(history_df)
+    chore_wheel.save_workbook(workbook, main_df, history)
+    assert chore_wheel.FairnessState.load(workbook) is None
+
+
+def test_incremental_stats_match_a_full_rebuild(workbook):
+    main_df, history_df = chore_wheel.load_excel(workbook, quiet)
+    state = chore_wheel.FairnessState.from_frames(main_df, history_df)
+    main_df = state.roster.copy()
+    for _ in range(9):
+        main_df, _ = chore_wheel.spin_week(
+            main_df, state.history, log=quiet, state=state
+        )
+
+    rebuilt = chore_wheel.ChoreStats.from_frame(main_df, state.history)
+    for name in ("last_week", "last_any", "streak", "longest"):
+        np.testing.assert_array_equal(
+            getattr(state.stats, name), getattr(rebuilt, name)
+        )
+
+
+def test_sheet_cache_is_used_until_the_workbook_changes(workbook, monkeypatch):
+    sheets = chore_wheel.read_workbook(workbook)
+
+    def no_parse(*args, **kwargs):
+        raise AssertionError("the workbook was parsed again")
+
+    monkeypatch.setattr(chore_wheel.pd, "read_excel", no_parse)
+    cached = chore_wheel.read_workbook(workbook)
+    assert list(cached) == list(sheets)
+    monkeypatch.undo()
+
+    main_df = sheets[chore_wheel.ASSIGNMENT_SHEET].copy()
+    main_df["Week 1"] = "Fridges"
+    history = chore_wheel.ChoreHistory.from_dataframe(sheets[chore_wheel.HISTORY_SHEET])
+    with pd.ExcelWriter(workbook, engine="openpyxl") as writer:
+        main_df.to_excel(writer, index=False, sheet_name=chore_wheel.ASSIGNMENT_SHEET)
+        history.to_dataframe().to_excel(
+            writer, index=False, sheet_name=chore_wheel.HISTORY_SHEET
+        )
+
+    assert chore_wheel.read_cached_sheets(workbook) is None
+    reread = chore_wheel.read_workbook(workbook)
+    assert "Week 1" in reread[chore_wheel.ASSIGNMENT_SHEET].columns